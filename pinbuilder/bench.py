@@ -0,0 +1,259 @@
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from subprocess import run
+from typing import TypedDict
+
+from .game import Game
+from .math.bezier_path import BezierPath
+from .math.affine import Affine
+from .math.vectors import Vec2
+from .objects.ramp import Ramp
+from .scad import ScadWriter
+from .svg.parser import parse
+
+
+class Timing(TypedDict):
+    min: float
+    median: float
+    runs: list[float]
+
+
+class Report(TypedDict):
+    version: int
+    python: str
+    machine: str
+    time: str
+    parameters: dict[str, int]
+    stages: dict[str, Timing]
+
+
+DECORATIONS = ["Post", "PopBumper", "Saucer", "Target", "GeneralIllumination", ""]
+
+
+class Playfield:
+    """Writes synthetic Inkscape SVGs shaped like a real table, for benchmarking."""
+
+    def __init__(
+        self,
+        ramps: int = 8,
+        segments: int = 6,
+        decorations: int = 200,
+        seed: int = 0,
+        width: float = 500,
+        height: float = 1000,
+    ) -> None:
+        self.ramps = ramps
+        self.segments = segments
+        self.decorations = decorations
+        self.seed = seed
+        self.width = width
+        self.height = height
+
+    def ramp(self, rng: random.Random, id: str, lane: float) -> list[str]:
+        """Returns the path elements of a ramp climbing the table around the given x."""
+        step = (self.height * 0.8) / self.segments
+        points = [(lane, self.height * 0.9)]
+        for _ in range(self.segments):
+            y = points[-1][1]
+            points.append((lane + rng.uniform(-20, 20), y - step))
+
+        d = f"M {points[0][0]:.3f},{points[0][1]:.3f}"
+        for (x0, y0), (x1, y1) in zip(points, points[1:]):
+            bend = rng.uniform(-15, 15)
+            d += (
+                f" C {x0 + bend:.3f},{y0 - step / 3:.3f}"
+                f" {x1 - bend:.3f},{y1 + step / 3:.3f} {x1:.3f},{y1:.3f}"
+            )
+        elements = [f'<path inkscape:label="RampPath {id}" d="{d}"/>']
+
+        for i, (x, y) in enumerate(points):
+            w = rng.uniform(18, 25)
+            elements.append(
+                f'<path inkscape:label="RampWidth {id} {i}" d="M {x - w:.3f},{y:.3f} H {x + w:.3f}"/>'
+            )
+
+        basepath = BezierPath.from_svgd(
+            d, Vec2.from_coords(self.width, self.height), Affine()
+        )
+        run = basepath.length(basepath.fits())
+        low, high = rng.uniform(20, 40), rng.uniform(60, 100)
+        elements.append(
+            f'<path inkscape:label="RampHeight {id}" d="M 0,{self.height - low:.3f}'
+            f" C {run / 3:.6f},{self.height - low:.3f} {2 * run / 3:.6f},{self.height - high:.3f}"
+            f' {run:.6f},{self.height - high:.3f}"/>'
+        )
+        return elements
+
+    def decoration(self, rng: random.Random) -> str:
+        """Returns a random non-ramp element, either a circle or a small closed path."""
+        label = rng.choice(DECORATIONS)
+        attribute = f' inkscape:label="{label}"' if label else ""
+        x, y = rng.uniform(0, self.width), rng.uniform(0, self.height)
+        if rng.random() < 0.5:
+            return f'<circle{attribute} cx="{x:.3f}" cy="{y:.3f}" r="{rng.uniform(3, 20):.3f}"/>'
+        return f'<path{attribute} d="M {x:.3f},{y:.3f} l 10,0 0,10 -10,0 z"/>'
+
+    @property
+    def svg(self) -> str:
+        rng = random.Random(self.seed)
+        elements: list[str] = []
+        for i in range(self.ramps):
+            lane = self.width * (i + 0.5) / max(self.ramps, 1)
+            elements += self.ramp(rng, f"r{i}", lane)
+        elements += [self.decoration(rng) for _ in range(self.decorations)]
+        rng.shuffle(elements)
+
+        body = "\n    ".join(elements)
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg width="{self.width:g}mm" height="{self.height:g}mm" '
+            f'viewBox="0 0 {self.width:g} {self.height:g}" '
+            'xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">\n'
+            '  <g inkscape:label="Layer 1" transform="translate(0,0)">\n'
+            f"    {body}\n"
+            "  </g>\n"
+            "</svg>\n"
+        )
+
+    def write(self, path: Path) -> Path:
+        _ = path.write_text(self.svg)
+        return path
+
+
+class Bench:
+    """Times each stage of turning a table SVG into SCAD, separately and end to end."""
+
+    def __init__(self, path: Path, repeat: int = 5) -> None:
+        self.path = path
+        self.repeat = repeat
+
+    @staticmethod
+    def time(stage: Callable[[], object], repeat: int) -> list[float]:
+        """Returns the wall time in seconds of each of repeat calls to stage."""
+        times: list[float] = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _ = stage()
+            times.append(time.perf_counter() - start)
+        return times
+
+    @staticmethod
+    def command(*args: str) -> None:
+        """Run pb with args in a fresh interpreter, as a cold start from a shell would."""
+        _ = run(
+            [sys.executable, "-m", "pinbuilder.cli", *args],
+            capture_output=True,
+            check=True,
+        )
+
+    def stages(self, out: Path) -> dict[str, Callable[[], object]]:
+        """Returns each benchmarked stage, in pipeline order, as a callable over fresh inputs."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            index = parse(self.path, include=Ramp.features, keep_nodes=False)
+            ramps = list(Ramp.collate_ramps(index).values())
+        features = [f for f in index if f.svgd]
+        sources = [ramp.sources for ramp in ramps]
+        fits = [basepath.fits() for basepath, _, _ in sources]
+        for ramp in ramps:
+            _ = ramp.geometry
+
+        def generate() -> None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                Game(self.path, include=Ramp.features).generate(out)
+
+        return {
+            "startup_version": lambda: self.command("--version"),
+            "startup_list": lambda: self.command("list", str(self.path)),
+            "parse": lambda: parse(self.path, keep_nodes=False),
+            "from_svgd": lambda: [
+                BezierPath.from_svgd(f.svgd, f.dimensions, f.transform)  # pyright: ignore[reportArgumentType]
+                for f in features
+            ],
+            "fits": lambda: [basepath.fits() for basepath, _, _ in sources],
+            "with_height": lambda: [
+                basepath.with_height(heightpath, fit)
+                for (basepath, _, heightpath), fit in zip(sources, fits)
+            ],
+            "scad": lambda: [
+                (
+                    ScadWriter.render(ramp.write_scad),
+                    ScadWriter.render(ramp.write_scad_cutter),
+                )
+                for ramp in ramps
+            ],
+            "generate": generate,
+        }
+
+    def run(self) -> dict[str, Timing]:
+        """Returns the min, median and every run time of each stage in seconds."""
+        with tempfile.TemporaryDirectory() as out:
+            results: dict[str, Timing] = {}
+            for name, stage in self.stages(Path(out)).items():
+                times = self.time(stage, self.repeat)
+                results[name] = {
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "runs": times,
+                }
+        return results
+
+    @staticmethod
+    def report(parameters: dict[str, int], stages: dict[str, Timing]) -> Report:
+        """Returns a JSON-ready record of a benchmark run and the machine it ran on."""
+        return {
+            "version": 1,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "parameters": parameters,
+            "stages": stages,
+        }
+
+    @staticmethod
+    def compare(
+        current: Report,
+        baseline: Report,
+        tolerance: float = 0.1,
+    ) -> list[str]:
+        """Returns a description of each stage whose min time grew by more than tolerance over the baseline."""
+        regressions: list[str] = []
+        for name, stage in current["stages"].items():
+            before = baseline.get("stages", {}).get(name)
+            if before is None or before["min"] <= 0:
+                continue
+            ratio = stage["min"] / before["min"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name}: {before['min'] * 1000:.2f}ms -> {stage['min'] * 1000:.2f}ms ({ratio:.2f}x)"
+                )
+        return regressions
+
+    @staticmethod
+    def over_budget(report: Report, budget: float) -> list[str]:
+        """Returns a description of each startup stage whose min time exceeds budget milliseconds."""
+        return [
+            f"{name}: {stage['min'] * 1000:.2f}ms over the {budget:.0f}ms budget"
+            for name, stage in report["stages"].items()
+            if name.startswith("startup_") and stage["min"] * 1000 > budget
+        ]
+
+    @staticmethod
+    def load(path: Path) -> Report:
+        with open(path) as file:
+            report: Report = json.load(file)  # pyright: ignore[reportAny]
+        return report
+
+    @staticmethod
+    def save(path: Path, report: Report) -> None:
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
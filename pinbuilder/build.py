@@ -0,0 +1,158 @@
+import glob
+import hashlib
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .cache import VERSION, GeometryCache
+from .formats import Format
+from .game import Game
+from .objects.ramp import Ramp
+from .quality import Quality
+
+
+class Build:
+    """Generates many tables in one process, sharing a single pool of geometry workers.
+
+    Every table writes to its own directory under out, named after the SVG. A table is
+    skipped when the hash of its SVG and the output options matches the one recorded by
+    its last successful build.
+    """
+
+    stamp = ".pinbuilder-build"
+
+    def __init__(
+        self,
+        out: Path,
+        cache: GeometryCache | None = None,
+        jobs: int = 1,
+        precision: int = 4,
+        format: Format = Format.SCAD,
+        force: bool = False,
+        quality: Quality = Quality.NORMAL,
+        tolerance: float = 1e-2,
+    ) -> None:
+        self.out = out
+        self.cache = cache
+        self.jobs = jobs
+        self.precision = precision
+        self.format = format
+        self.force = force
+        self.quality = quality
+        self.tolerance = tolerance
+
+    @staticmethod
+    def expand(patterns: list[str]) -> list[Path]:
+        """Returns the SVGs named by each file, directory or glob pattern, without repeats."""
+        paths: list[Path] = []
+        for pattern in patterns:
+            path = Path(pattern)
+            if path.is_dir():
+                paths += sorted(path.glob("*.svg"))
+            elif path.exists():
+                paths.append(path)
+            else:
+                matches = sorted(Path(match) for match in glob.glob(pattern))
+                if not matches:
+                    raise ValueError(f"No tables match {pattern}")
+                paths += matches
+        return list(dict.fromkeys(path.resolve() for path in paths))
+
+    def digest(self, path: Path) -> str:
+        """Returns a hash of the table's SVG together with everything that shapes its output."""
+        digest = hashlib.sha256(path.read_bytes())
+        digest.update(
+            f"{VERSION};{self.precision};{self.format};{self.quality};{self.tolerance!r}".encode()
+        )
+        return digest.hexdigest()
+
+    def target(self, path: Path) -> Path:
+        return self.out / path.stem
+
+    def is_current(self, path: Path, digest: str) -> bool:
+        try:
+            return (self.target(path) / self.stamp).read_text() == digest
+        except OSError:
+            return False
+
+    def build(
+        self, paths: list[Path]
+    ) -> tuple[list[Path], list[Path], dict[Path, str]]:
+        """Build every stale table, returning which were built, which were skipped and why any failed."""
+        stems = [path.stem for path in paths]
+        clashes = sorted({stem for stem in stems if stems.count(stem) > 1})
+        if clashes:
+            raise ValueError(f"Tables share output directories: {', '.join(clashes)}")
+
+        digests = {path: self.digest(path) for path in paths}
+        skipped = [
+            path
+            for path in paths
+            if not self.force and self.is_current(path, digests[path])
+        ]
+        failed: dict[Path, str] = {}
+        games: dict[Path, Game] = {}
+        for path in paths:
+            if path in skipped:
+                continue
+            try:
+                games[path] = Game(
+                    path, include=Ramp.features, tolerance=self.tolerance
+                )
+            except (ET.ParseError, ValueError) as error:
+                failed[path] = str(error)
+
+        pending: list[Ramp] = []
+        for path, game in list(games.items()):
+            try:
+                stale = game.pending(cache=self.cache)
+                for ramp in stale:
+                    _ = ramp.payload
+            except ValueError as error:
+                failed[path] = str(error)
+                del games[path]
+                continue
+            pending += stale
+
+        if self.jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(pending))) as pool:
+                Game.compute(pending, pool)
+        else:
+            Game.compute(pending)
+        if self.cache is not None:
+            for ramp in pending:
+                self.cache.put(ramp.digest, ramp.geometry)
+
+        built: list[Path] = []
+        for path, game in games.items():
+            target = self.target(path)
+            try:
+                game.output(target, self.precision, self.format, self.quality)
+            except ValueError as error:
+                failed[path] = str(error)
+                continue
+            _ = (target / self.stamp).write_text(digests[path])
+            built.append(path)
+        return built, skipped, failed
+
+    def summary(
+        self,
+        built: list[Path],
+        skipped: list[Path],
+        failed: dict[Path, str],
+        elapsed: float,
+    ) -> str:
+        lines = [f"Failed {path.stem}: {error}" for path, error in failed.items()]
+        lines.append(
+            f"Built {len(built)} tables, skipped {len(skipped)} unchanged, "
+            f"{len(failed)} failed in {elapsed:.2f}s"
+        )
+        return "\n".join(lines)
+
+    def run(self, patterns: list[str]) -> bool:
+        """Build the tables matching patterns and print a summary, returning whether all succeeded."""
+        start = time.perf_counter()
+        built, skipped, failed = self.build(self.expand(patterns))
+        print(self.summary(built, skipped, failed, time.perf_counter() - start))
+        return not failed
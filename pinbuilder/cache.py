@@ -0,0 +1,136 @@
+import os
+import shutil
+import numpy as np
+from contextlib import suppress
+from numpy.lib.npyio import NpzFile
+from pathlib import Path
+
+from .objects.ramp_geometry import RampGeometry
+
+VERSION = "5"
+
+
+class DiskCache:
+    """A size-bounded on-disk store of files keyed by a content hash.
+
+    Reading an entry refreshes its modification time, and writes evict the least recently
+    used entries once the store grows past max_bytes.
+    """
+
+    name = ""
+    suffix = ""
+
+    def __init__(self, root: Path | None = None, max_bytes: int = 256 * 2**20) -> None:
+        self.root = self.default_root() if root is None else root
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def default_root(cls) -> Path:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        base = Path(xdg) if xdg else Path.home() / ".cache"
+        return base / "pinbuilder" / cls.name
+
+    def entry(self, key: str) -> Path:
+        return self.root / f"{VERSION}-{key}{self.suffix}"
+
+    def evict(self) -> None:
+        """Deletes least recently used entries until the cache fits in max_bytes."""
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> int:
+        """Deletes every entry in the cache and returns how many were removed."""
+        if not self.root.exists():
+            return 0
+        removed = 0
+        for path in self.root.glob(f"*{self.suffix}"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+class GeometryCache(DiskCache):
+    """Ramp geometry keyed by a hash of the ramp's inputs, stored as uncompressed .npz files."""
+
+    name = "geometry"
+    suffix = ".npz"
+
+    def get(self, key: str) -> RampGeometry | None:
+        """Returns the cached geometry for key, or None on a miss or unreadable entry."""
+        entry = self.entry(key)
+        try:
+            archive: NpzFile = np.load(entry)  # pyright: ignore[reportAny]
+            with archive as data:
+                geometry = RampGeometry(
+                    fits=data["fits"],
+                    path=data["path"],
+                    widths=data["widths"],
+                    scales=data["scales"],
+                    length=data["length"],
+                )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        # Another process may evict the entry as soon as it has been read.
+        with suppress(FileNotFoundError):
+            os.utime(entry)
+        return geometry
+
+    def put(self, key: str, geometry: RampGeometry) -> None:
+        """Stores geometry under key and evicts old entries if the cache is over budget."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = self.entry(key)
+        partial = entry.with_suffix(f".{os.getpid()}.tmp")
+        arrays = geometry.arrays
+        with open(partial, "wb") as file:
+            np.savez(
+                file,
+                fits=arrays["fits"],
+                path=arrays["path"],
+                widths=arrays["widths"],
+                scales=arrays["scales"],
+                length=arrays["length"],
+            )
+        os.replace(partial, entry)
+        self.evict()
+
+
+class RenderCache(DiskCache):
+    """Rendered STL files keyed by a hash of the SCAD they were rendered from."""
+
+    name = "renders"
+    suffix = ".stl"
+
+    def __init__(self, root: Path | None = None, max_bytes: int = 1024 * 2**20) -> None:
+        super().__init__(root, max_bytes)
+
+    def get(self, key: str, target: Path) -> bool:
+        """Copies the cached render for key to target, returning whether there was one."""
+        entry = self.entry(key)
+        try:
+            _ = shutil.copyfile(entry, target)
+        except OSError:
+            return False
+        with suppress(FileNotFoundError):
+            os.utime(entry)
+        return True
+
+    def put(self, key: str, source: Path) -> None:
+        """Stores a copy of the rendered file under key and evicts old entries if the cache is over budget."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = self.entry(key)
+        partial = entry.with_suffix(f".{os.getpid()}.tmp")
+        _ = shutil.copyfile(source, partial)
+        os.replace(partial, entry)
+        self.evict()
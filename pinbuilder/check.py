@@ -0,0 +1,213 @@
+import numpy as np
+import numpy.typing as npt
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .math.grid import GridIndex
+from .math.path import Path
+from .math.vectors import Vec2
+from .objects.ramp import Ramp
+from .svg.features import (
+    Feature,
+    FlipperBase,
+    FlipperTip,
+    PlayfieldCutout,
+    PopBumper,
+    Post,
+    Saucer,
+    Target,
+)
+
+# Default height in mm a ramp's underside has to stay above each type of feature.
+CLEARANCES: dict[type[Feature], float] = {
+    Post: 35,
+    PopBumper: 80,
+    Saucer: 10,
+    Target: 45,
+    FlipperBase: 30,
+    FlipperTip: 30,
+    PlayfieldCutout: 1,
+}
+
+
+class Collision(NamedTuple):
+    ramp: str
+    feature: Feature
+    location: Vec2
+    distance: float
+    height: float
+    clearance: float
+
+    def describe(self) -> str:
+        name = type(self.feature).__name__
+        if self.feature.labels:
+            name += f" '{self.feature.labels[0]}'"
+        return (
+            f"Ramp '{self.ramp}' passes {self.height:.1f}mm over {name} "
+            f"at {self.location}, {self.distance:.1f}mm along, "
+            f"needs {self.clearance:.1f}mm"
+        )
+
+
+class ClearanceCheck:
+    """Finds places where a ramp runs too low over a playfield feature.
+
+    Every ramp station segment is indexed in a uniform grid by the bounding box of its
+    swept footprint, so each feature only measures against the segments near it. Distances
+    are taken between ramp segments and the edges of the feature's outline, since an
+    outline keeps only the corners of its straight edges.
+    """
+
+    def __init__(
+        self,
+        ramps: dict[str, Ramp],
+        clearances: dict[type[Feature], float] = CLEARANCES,
+        margin: float = 0,
+        t: float = 2,
+        o: float = 5,
+    ) -> None:
+        self.clearances = dict(clearances)
+        self.margin = margin
+
+        ids: list[str] = []
+        starts: list[npt.NDArray[np.float64]] = []
+        ends: list[npt.NDArray[np.float64]] = []
+        reaches: list[npt.NDArray[np.float64]] = []
+        heights: list[npt.NDArray[np.float64]] = []
+        distances: list[npt.NDArray[np.float64]] = []
+        for rampid, ramp in ramps.items():
+            geometry = ramp.geometry
+            path = geometry.path.array
+            reach = (geometry.width / 2 + t + o) * geometry.scales.array[:, 0]
+            ids += [rampid] * (len(path) - 1)
+            starts.append(path[:-1, :2])
+            ends.append(path[1:, :2])
+            reaches.append(np.maximum(reach[:-1], reach[1:]))
+            heights.append(np.minimum(path[:-1, 2], path[1:, 2]) - t)
+            distances.append(Path(path[:, :2]).point_distances[:-1])
+
+        self.ids = ids
+        self.starts = np.concatenate(starts) if starts else np.zeros((0, 2))
+        self.ends = np.concatenate(ends) if ends else np.zeros((0, 2))
+        self.reaches = np.concatenate(reaches) if reaches else np.zeros(0)
+        self.heights = np.concatenate(heights) if heights else np.zeros(0)
+        self.distances = np.concatenate(distances) if distances else np.zeros(0)
+
+        low = np.minimum(self.starts, self.ends) - self.reaches[:, np.newaxis]
+        high = np.maximum(self.starts, self.ends) + self.reaches[:, np.newaxis]
+        self.index = GridIndex(np.concatenate((low, high), axis=1))
+
+    @staticmethod
+    def footprint(
+        feature: Feature,
+    ) -> tuple[npt.NDArray[np.float64], float, bool] | None:
+        """Returns a feature's outline points, the radius around them and whether the outline is closed."""
+        if feature.bezierpath is not None:
+            bezierpath = feature.bezierpath
+            points = bezierpath.path(bezierpath.fits(1e-1, 0)).array
+            return points, 0.0, bool(np.allclose(points[0], points[-1]))  # pyright: ignore[reportAny]
+        if feature.center is not None:
+            return feature.center.array[np.newaxis], feature.radius, False
+        return None
+
+    @staticmethod
+    def inside(
+        points: npt.NDArray[np.float64], polygon: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.bool_]:
+        """Returns which points lie inside a closed polygon by the even-odd rule."""
+        a, b = polygon[:-1], polygon[1:]
+        px, py = points[:, 0, np.newaxis], points[:, 1, np.newaxis]
+        crosses = np.not_equal(a[:, 1] > py, b[:, 1] > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = a[:, 0] + (py - a[:, 1]) * (b[:, 0] - a[:, 0]) / (b[:, 1] - a[:, 1])
+        counts: npt.NDArray[np.int64] = np.sum(crosses & np.less(px, x), axis=1)
+        return np.equal(counts % 2, 1)
+
+    @staticmethod
+    def to_segments(
+        points: npt.NDArray[np.float64],
+        a: npt.NDArray[np.float64],
+        b: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """Returns the distance from each point to the segment from a to b, broadcasting over all three."""
+        ab = b - a
+        ap = points - a
+        length = np.maximum(np.sum(ab * ab, axis=-1), 1e-12)
+        u = np.clip(np.sum(ap * ab, axis=-1) / length, 0, 1)
+        offset = ap - u[..., np.newaxis] * ab
+        return np.sqrt(np.sum(offset * offset, axis=-1))
+
+    @staticmethod
+    def separations(
+        a: npt.NDArray[np.float64],
+        b: npt.NDArray[np.float64],
+        c: npt.NDArray[np.float64],
+        d: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """Returns the (M, K) distances between the (M,) segments from a to b and the (K,) segments from c to d."""
+        a, b = a[:, np.newaxis], b[:, np.newaxis]
+        distances = np.minimum(
+            np.minimum(
+                ClearanceCheck.to_segments(a, c, d), ClearanceCheck.to_segments(b, c, d)
+            ),
+            np.minimum(
+                ClearanceCheck.to_segments(c, a, b), ClearanceCheck.to_segments(d, a, b)
+            ),
+        )
+
+        def turns(
+            o: npt.NDArray[np.float64],
+            p: npt.NDArray[np.float64],
+            q: npt.NDArray[np.float64],
+        ) -> npt.NDArray[np.float64]:
+            return (p[..., 0] - o[..., 0]) * (q[..., 1] - o[..., 1]) - (
+                p[..., 1] - o[..., 1]
+            ) * (q[..., 0] - o[..., 0])
+
+        crossing = (turns(c, d, a) * turns(c, d, b) < 0) & (
+            turns(a, b, c) * turns(a, b, d) < 0
+        )
+        return np.where(crossing, 0, distances)
+
+    def collisions(self, feature: Feature) -> list[Collision]:
+        """Returns the lowest violating pass of each ramp over the feature."""
+        clearance = self.clearances.get(type(feature))
+        footprint = self.footprint(feature)
+        if clearance is None or footprint is None:
+            return []
+        points, radius, closed = footprint
+        location = feature.center or Vec2(points.mean(axis=0).tolist())  # pyright: ignore[reportAny]
+
+        spread = radius + self.margin
+        box = np.concatenate((points.min(axis=0) - spread, points.max(axis=0) + spread))
+        candidates = self.index.query(box)
+        candidates = candidates[self.heights[candidates] < clearance]
+        if len(candidates) == 0:
+            return []
+
+        a, b = self.starts[candidates], self.ends[candidates]
+        edges = (points[:-1], points[1:]) if len(points) > 1 else (points, points)
+        nearest = np.min(self.separations(a, b, *edges), axis=1)
+        hits = nearest < self.reaches[candidates] + spread
+        if closed:
+            hits |= self.inside(a, points) | self.inside(b, points)
+
+        lowest: dict[str, Collision] = {}
+        found: list[int] = candidates[hits].tolist()  # pyright: ignore[reportAny]
+        for i in found:
+            rampid = self.ids[i]
+            if rampid not in lowest or self.heights[i] < lowest[rampid].height:
+                lowest[rampid] = Collision(
+                    rampid,
+                    feature,
+                    location,
+                    float(self.distances[i]),  # pyright: ignore[reportAny]
+                    float(self.heights[i]),  # pyright: ignore[reportAny]
+                    clearance,
+                )
+        return list(lowest.values())
+
+    def run(self, features: Iterable[Feature]) -> list[Collision]:
+        return [
+            collision for feature in features for collision in self.collisions(feature)
+        ]
@@ -1,31 +1,274 @@
 import typer
 from pathlib import Path
-from subprocess import run
-from .game import Game
+from typing import Annotated
+from .formats import Format
+from .quality import Quality
+
+# Commands import what they need when they run, so short commands such as list and
+# --version do not pay for NumPy and the geometry code at startup.
 
 app = typer.Typer()
+cache_app = typer.Typer()
+app.add_typer(cache_app, name="cache")
+
+
+def show_version(value: bool):
+    if value:
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            print(version("pinbuilder"))
+        except PackageNotFoundError:
+            print("unknown")
+        raise typer.Exit()
+
+
+@app.callback()
+def main(
+    version: Annotated[
+        bool, typer.Option("--version", callback=show_version, is_eager=True)
+    ] = False,
+):
+    pass
+
+
+@app.command("list")
+def list_features(path: Path):
+    from .objects.ramp_parts import RampParts
+    from .svg.parser import parse
+
+    print(path.stem)
+    for problem in RampParts.problems(parse(path, keep_nodes=False)):
+        print(problem)
 
 
 @app.command()
-def list(path: Path):
-    _ = Game(path)
+def generate(
+    path: Path,
+    out: Path | None = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j")] = 1,
+    precision: int | None = None,
+    format: Format = Format.SCAD,
+    quality: Quality = Quality.NORMAL,
+    tolerance: float | None = None,
+    profile: bool = False,
+    trace: Path | None = None,
+):
+    from .cache import GeometryCache
+    from .game import Game
+    from .objects.ramp import Ramp
+    from .profiler import Profiler
+
+    if out is None:
+        out = Path("output")
+    if precision is None:
+        precision = quality.precision
+    if tolerance is None:
+        tolerance = quality.tolerance
+
+    profiler = Profiler() if profile or trace is not None else None
+    if profiler is not None:
+        profiler.start()
+
+    cache = None if no_cache else GeometryCache()
+    Game(path, include=Ramp.features, tolerance=tolerance).generate(
+        out,
+        cache=cache,
+        jobs=jobs,
+        precision=precision,
+        format=format,
+        quality=quality,
+    )
+
+    if profiler is not None:
+        profiler.stop()
+        print(profiler.summary)
+        if trace is not None:
+            profiler.write_trace(trace)
 
 
 @app.command()
-def generate(path: Path, out: Path | None = None):
+def build(
+    paths: list[str],
+    out: Path | None = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j")] = 1,
+    precision: int | None = None,
+    format: Format = Format.SCAD,
+    quality: Quality = Quality.NORMAL,
+    tolerance: float | None = None,
+    force: bool = False,
+):
+    from .build import Build
+    from .cache import GeometryCache
+
+    if out is None:
+        out = Path("output")
+    if precision is None:
+        precision = quality.precision
+    if tolerance is None:
+        tolerance = quality.tolerance
+
+    cache = None if no_cache else GeometryCache()
+    if not Build(out, cache, jobs, precision, format, force, quality, tolerance).run(
+        paths
+    ):
+        raise typer.Exit(1)
+
+
+@app.command()
+def render(
+    path: Path,
+    out: Path | None = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache")] = False,
+    jobs: Annotated[int | None, typer.Option("--jobs", "-j")] = None,
+    precision: int | None = None,
+    quality: Quality = Quality.NORMAL,
+    tolerance: float | None = None,
+    openscad: str = "openscad",
+):
+    from .cache import GeometryCache, RenderCache
+    from .game import Game
+    from .objects.ramp import Ramp
+    from .render import Render
+
     if out is None:
         out = Path("output")
+    if precision is None:
+        precision = quality.precision
+    if tolerance is None:
+        tolerance = quality.tolerance
 
-    Game(path).generate(out)
+    game = Game(path, include=Ramp.features, tolerance=tolerance)
+    game.solve(cache=None if no_cache else GeometryCache())
+    cache = None if no_cache else RenderCache()
+    try:
+        rendered, reused = Render(out, cache, jobs, precision, openscad, quality).run(
+            game
+        )
+    except ValueError as error:
+        print(error)
+        raise typer.Exit(1)
+    print(f"Rendered {rendered} units, reused {reused} from the cache")
+
+
+@app.command()
+def watch(
+    path: Path,
+    out: Path | None = None,
+    no_cache: Annotated[bool, typer.Option("--no-cache")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j")] = 1,
+    precision: int | None = None,
+    quality: Quality = Quality.NORMAL,
+    tolerance: float | None = None,
+    interval: float = 0.25,
+):
+    from .cache import GeometryCache
+    from .watch import Watch
+
+    if out is None:
+        out = Path("output")
+    if precision is None:
+        precision = quality.precision
+    if tolerance is None:
+        tolerance = quality.tolerance
+
+    cache = None if no_cache else GeometryCache()
+    Watch(
+        path,
+        out,
+        cache=cache,
+        jobs=jobs,
+        precision=precision,
+        quality=quality,
+        tolerance=tolerance,
+    ).run(interval)
+
+
+@app.command()
+def check(path: Path, margin: float = 0):
+    from .check import CLEARANCES, ClearanceCheck
+    from .game import Game
+    from .objects.ramp import Ramp
+
+    game = Game(path, include=Ramp.features + tuple(CLEARANCES))
+    collisions = ClearanceCheck(game.ramps, margin=margin).run(game.svg_features)
+    for collision in collisions:
+        print(collision.describe())
+    if collisions:
+        raise typer.Exit(1)
+
+
+@app.command()
+def bench(
+    out: Path | None = None,
+    ramps: int = 8,
+    segments: int = 6,
+    decorations: int = 200,
+    repeat: int = 5,
+    seed: int = 0,
+    baseline: Path | None = None,
+    tolerance: float = 0.1,
+    startup_budget: float = 150,
+):
+    import tempfile
+    from .bench import Bench, Playfield
+
+    if out is None:
+        out = Path("bench.json")
+
+    parameters = {
+        "ramps": ramps,
+        "segments": segments,
+        "decorations": decorations,
+        "repeat": repeat,
+        "seed": seed,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        svg = Playfield(ramps, segments, decorations, seed).write(
+            Path(tmp) / "synthetic.svg"
+        )
+        report = Bench.report(parameters, Bench(svg, repeat).run())
+    Bench.save(out, report)
+    for name, stage in report["stages"].items():
+        print(
+            f"{name:16} min {stage['min'] * 1000:9.2f}ms  median {stage['median'] * 1000:9.2f}ms"
+        )
+
+    failures = [
+        f"Slow startup in {slow}" for slow in Bench.over_budget(report, startup_budget)
+    ]
+    if baseline is not None:
+        failures += [
+            f"Regression in {regression}"
+            for regression in Bench.compare(report, Bench.load(baseline), tolerance)
+        ]
+    for failure in failures:
+        print(failure)
+    if failures:
+        raise typer.Exit(1)
 
 
 @app.command()
 def test():
+    from subprocess import run
+
     cmd = "openscad --version"
     process = run(cmd.split(" "), capture_output=True)
     print(process.stdout.decode("ascii"))
     print(process.stderr.decode("ascii"))
 
 
+@cache_app.command("clear")
+def cache_clear():
+    from .cache import GeometryCache, RenderCache
+
+    removed = GeometryCache().clear()
+    print(f"Removed {removed} cached ramps")
+    removed = RenderCache().clear()
+    print(f"Removed {removed} cached renders")
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class Format(StrEnum):
+    SCAD = "scad"
+    STL = "stl"
+    THREEMF = "3mf"
@@ -1,37 +1,151 @@
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 
+from .cache import GeometryCache
+from .formats import Format
+from .mesh import Mesh
+from .profiler import Profiler
+from .quality import Quality
+from .scad import Fragment, ScadWriter
+from .svg.features import Feature
 from .svg.parser import parse
 from .objects.ramp import Ramp
+from .objects.ramp_geometry import RampGeometry
 
 
 class Game:
-    def __init__(self, path: Path):
-        print(path.stem)
-        self.svg_features = parse(path)
-        self.ramps = Ramp.collate_ramps(self.svg_features)
-
-    def generate(self, out: Path):
-        headers = """
+    headers = """
         include <BOSL2/beziers.scad>
         include <BOSL2/std.scad>
         """
-        out.mkdir(parents=True, exist_ok=True)
 
-        ramp_bodies = (
-            "union() {"
-            + "".join([ramp.scad for rampid, ramp in self.ramps.items()])
-            + "}"
-        )
+    def __init__(
+        self,
+        path: Path,
+        known: dict[tuple[str, ...], Feature] | None = None,
+        include: tuple[type[Feature], ...] | None = None,
+        tolerance: float = 1e-2,
+    ):
+        print(path.stem)
+        with Profiler.stage("parse"):
+            self.svg_features = parse(path, known, include, keep_nodes=False)
+        for problem in Ramp.problems(self.svg_features):
+            print(problem)
+        with Profiler.stage("collate"):
+            self.ramps = Ramp.collate_ramps(self.svg_features, tolerance)
+
+    def pending(
+        self, ramps: list[Ramp] | None = None, cache: GeometryCache | None = None
+    ) -> list[Ramp]:
+        """Give each ramp the geometry the cache has for it, returning those still without one."""
+        pending: list[Ramp] = []
+        with Profiler.stage("cache"):
+            for ramp in self.ramps.values() if ramps is None else ramps:
+                geometry = None if cache is None else cache.get(ramp.digest)
+                if geometry is None:
+                    pending.append(ramp)
+                else:
+                    ramp.geometry = geometry
+        return pending
+
+    @staticmethod
+    def compute(ramps: list[Ramp], pool: Executor | None = None) -> None:
+        """Give each ramp its computed geometry, in the pool's worker processes if given one."""
+        with Profiler.stage("solve"):
+            if pool is not None and len(ramps) > 1:
+                parent = Profiler.active
+                results = pool.map(
+                    RampGeometry.solve,
+                    [ramp.payload for ramp in ramps],
+                    repeat(parent is not None),
+                )
+                for ramp, (arrays, profiler) in zip(ramps, results):
+                    ramp.geometry = RampGeometry(**arrays)
+                    if parent is not None and profiler is not None:
+                        parent.merge(profiler, ramp.basepath.id)
+            else:
+                for ramp in ramps:
+                    _ = ramp.geometry
 
-        ramp_cutter = (
-            "union() {"
-            + "".join([ramp.scad_cutter for rampid, ramp in self.ramps.items()])
-            + "}"
+    def solve(
+        self,
+        ramps: list[Ramp] | None = None,
+        cache: GeometryCache | None = None,
+        jobs: int = 1,
+    ) -> None:
+        """Give each ramp its geometry, taking what the cache has and computing the rest across jobs processes."""
+        pending = self.pending(ramps, cache)
+        if jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+                self.compute(pending, pool)
+        else:
+            self.compute(pending)
+
+        if cache is not None:
+            with Profiler.stage("cache"):
+                for ramp in pending:
+                    cache.put(ramp.digest, ramp.geometry)
+
+    def generate(
+        self,
+        out: Path,
+        cache: GeometryCache | None = None,
+        jobs: int = 1,
+        precision: int = 4,
+        format: Format = Format.SCAD,
+        quality: Quality = Quality.NORMAL,
+    ):
+        self.solve(cache=cache, jobs=jobs)
+        self.output(out, precision, format, quality)
+
+    def output(
+        self,
+        out: Path,
+        precision: int = 4,
+        format: Format = Format.SCAD,
+        quality: Quality = Quality.NORMAL,
+    ) -> None:
+        """Write the solved ramps to out in the given format."""
+        match format:
+            case Format.STL:
+                out.mkdir(parents=True, exist_ok=True)
+                meshes = [ramp.mesh for ramp in self.ramps.values()]
+                with Profiler.stage("write"):
+                    Mesh.merge(meshes).write_stl(out / "ramps.stl")
+                return
+            case Format.THREEMF:
+                out.mkdir(parents=True, exist_ok=True)
+                meshes = {rampid: ramp.mesh for rampid, ramp in self.ramps.items()}
+                with Profiler.stage("write"):
+                    Mesh.write_3mf(out / "ramps.3mf", meshes, precision)
+                return
+
+        self.write(
+            out,
+            [ramp.write_scad for rampid, ramp in self.ramps.items()],
+            [ramp.write_scad_cutter for rampid, ramp in self.ramps.items()],
+            precision,
+            quality,
         )
 
-        with open(out / "preview.scad", "w") as preview:
-            _ = preview.write(headers)
-            _ = preview.write("difference() {")
-            _ = preview.write(ramp_bodies)
-            _ = preview.write(ramp_cutter)
-            _ = preview.write("}")
+    @staticmethod
+    def write(
+        out: Path,
+        bodies: Iterable[Fragment],
+        cutters: Iterable[Fragment],
+        precision: int = 4,
+        quality: Quality = Quality.NORMAL,
+    ) -> None:
+        """Stream preview.scad, cutting the union of the cutters out of the union of the bodies."""
+        out.mkdir(parents=True, exist_ok=True)
+
+        with Profiler.stage("write"), open(out / "preview.scad", "w") as preview:
+            writer = ScadWriter(preview, precision)
+            writer.text(Game.headers)
+            writer.text(quality.settings)
+            writer.text("difference() {")
+            writer.union(bodies)
+            writer.union(cutters)
+            writer.text("}")
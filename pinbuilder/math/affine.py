@@ -0,0 +1,144 @@
+import math
+import re
+from typing import TYPE_CHECKING, Self, override
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+TRANSFORM = re.compile(
+    r"\s*(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)\s*,?"
+)
+NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+class Affine:
+    """A 2D affine transform stored as the six free entries of its 3×3 matrix.
+
+    Follows the SVG matrix(a, b, c, d, e, f) layout, mapping (x, y) to
+    (a x + c y + e, b x + d y + f). Composing with @ applies the right-hand
+    transform first, as nested SVG transforms do.
+    """
+
+    __slots__ = ("coords",)
+
+    def __init__(
+        self,
+        a: float = 1,
+        b: float = 0,
+        c: float = 0,
+        d: float = 1,
+        e: float = 0,
+        f: float = 0,
+    ) -> None:
+        self.coords: tuple[float, ...] = (a, b, c, d, e, f)
+
+    @classmethod
+    def translate(cls, x: float, y: float = 0) -> Self:
+        return cls(1, 0, 0, 1, x, y)
+
+    @classmethod
+    def scale(cls, x: float, y: float | None = None) -> Self:
+        return cls(x, 0, 0, x if y is None else y, 0, 0)
+
+    @classmethod
+    def rotate(cls, degrees: float, x: float = 0, y: float = 0) -> Self:
+        cos, sin = math.cos(math.radians(degrees)), math.sin(math.radians(degrees))
+        rotation = cls(cos, sin, -sin, cos, 0, 0)
+        return cls.translate(x, y) @ rotation @ cls.translate(-x, -y)
+
+    @classmethod
+    def skew_x(cls, degrees: float) -> Self:
+        return cls(1, 0, math.tan(math.radians(degrees)), 1, 0, 0)
+
+    @classmethod
+    def skew_y(cls, degrees: float) -> Self:
+        return cls(1, math.tan(math.radians(degrees)), 0, 1, 0, 0)
+
+    @classmethod
+    def from_string(cls, raw: str) -> Self:
+        """Returns the composition of an SVG transform attribute's list of transforms."""
+        transform = cls()
+        position = 0
+        while position < len(raw):
+            found = TRANSFORM.match(raw, position)
+            if found is None:
+                if raw[position:].strip():
+                    raise ValueError(f"Got bad transform: {raw}")
+                break
+            numbers: list[str] = NUMBER.findall(found.group(2))
+            args = [float(v) for v in numbers]
+            match found.group(1), len(args):
+                case "matrix", 6:
+                    step = cls(*args)
+                case "translate", 1 | 2:
+                    step = cls.translate(*args)
+                case "scale", 1 | 2:
+                    step = cls.scale(*args)
+                case "rotate", 1 | 3:
+                    step = cls.rotate(*args)
+                case "skewX", 1:
+                    step = cls.skew_x(*args)
+                case "skewY", 1:
+                    step = cls.skew_y(*args)
+                case _:
+                    raise ValueError(f"Got bad transform: {raw}")
+            transform = transform @ step
+            position = found.end()
+        return transform
+
+    def __matmul__(self, other: Self) -> Self:
+        a1, b1, c1, d1, e1, f1 = self.coords
+        a2, b2, c2, d2, e2, f2 = other.coords
+        return self.__class__(
+            a1 * a2 + c1 * b2,
+            b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2,
+            b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1,
+            b1 * e2 + d1 * f2 + f1,
+        )
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, self.__class__):
+            return self.coords == other.coords
+        return False
+
+    @override
+    def __hash__(self) -> int:
+        return hash(self.coords)
+
+    @override
+    def __repr__(self) -> str:
+        return f"matrix({','.join(str(v) for v in self.coords)})"
+
+    @property
+    def inverse(self) -> Self:
+        a, b, c, d, e, f = self.coords
+        det = a * d - b * c
+        if det == 0:
+            raise ValueError(f"Transform {self!r} cannot be inverted")
+        return self.__class__(
+            d / det,
+            -b / det,
+            -c / det,
+            a / det,
+            (c * f - d * e) / det,
+            (b * e - a * f) / det,
+        )
+
+    @property
+    def scaling(self) -> float:
+        """Returns the factor areas are scaled by, square rooted, for sizing radii."""
+        a, b, c, d, _, _ = self.coords
+        return math.sqrt(abs(a * d - b * c))
+
+    def point(self, x: float, y: float) -> tuple[float, float]:
+        a, b, c, d, e, f = self.coords
+        return a * x + c * y + e, b * x + d * y + f
+
+    def apply(self, points: "npt.NDArray[np.float64]") -> "npt.NDArray[np.float64]":
+        """Returns an (N, 2) array of points mapped through the transform in one multiply."""
+        a, b, c, d, e, f = self.coords
+        return points @ ((a, b), (c, d)) + (e, f)
@@ -5,6 +5,9 @@ from typing import Self
 from .vectors import Vec, Vec2, Vec3
 from .path import Path
 
+# Nodes and weights of the 8 point Gauss-Legendre rule on [-1, 1].
+GAUSS_NODES, GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(8)
+
 
 class Bezier:
     def __init__(self, array: npt.NDArray[np.float64]) -> None:
@@ -14,6 +17,42 @@ class Bezier:
     def from_points(cls, p1: Vec, c1: Vec, c2: Vec, p2: Vec) -> Self:
         return cls(np.stack((p1.array, c1.array, c2.array, p2.array)))
 
+    @staticmethod
+    def de_casteljau(
+        array: npt.NDArray[np.float64], u: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Evaluates an (M, 4, D) stack of beziers at the matching (M,) u values."""
+        u = u[:, np.newaxis, np.newaxis]
+        a: npt.NDArray[np.float64] = (array[:, 1:] - array[:, :-1]) * u + array[:, :-1]
+        b: npt.NDArray[np.float64] = (a[:, 1:] - a[:, :-1]) * u + a[:, :-1]
+        return (b[:, 1] - b[:, 0]) * u[:, 0] + b[:, 0]
+
+    @staticmethod
+    def derivative(
+        array: npt.NDArray[np.float64], u: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Returns the tangent of each of an (M, 4, D) stack of beziers at the matching (M,) u values."""
+        d = 3 * (array[:, 1:] - array[:, :-1])
+        u = u[:, np.newaxis]
+        a = (d[:, 1] - d[:, 0]) * u + d[:, 0]
+        b = (d[:, 2] - d[:, 1]) * u + d[:, 1]
+        return (b - a) * u + a
+
+    @staticmethod
+    def arc_lengths(
+        array: npt.NDArray[np.float64],
+        u0: npt.NDArray[np.float64],
+        u1: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """Returns the length of each of an (M, 4, D) stack of beziers between the matching u0 and u1 values."""
+        half = (u1 - u0) / 2
+        u = ((u1 + u0) / 2)[:, np.newaxis] + half[:, np.newaxis] * GAUSS_NODES
+        tangents = Bezier.derivative(
+            np.repeat(array, len(GAUSS_NODES), axis=0), u.ravel()
+        )
+        speed = np.sqrt(np.sum(tangents * tangents, axis=1)).reshape(u.shape)  # pyright: ignore[reportAny]
+        return half * (speed @ GAUSS_WEIGHTS)
+
     def path(self, samples: int = 0) -> Path:
         """Returns a Path instance containing the number of samples as points on this bezier."""
         u = np.linspace(0, 1.0, num=samples + 2)[np.newaxis, :, np.newaxis]
@@ -22,16 +61,31 @@ class Bezier:
         b = (a[1:] - a[:-1]) * u + a[:-1]
         return Path(((b[1] - b[0]) * u + b[0])[0])  # pyright: ignore[reportAny]
 
-    def fit(self, threshold: float = 1e-1) -> int:
-        """Returns the number of samples needed to acheive the given error rate for this bezier."""
+    @staticmethod
+    def flatness_samples(
+        array: npt.NDArray[np.float64], threshold: float, minimum: int = 16
+    ) -> npt.NDArray[np.int64]:
+        """Returns the number of samples needed for each of an (M, 4, D) stack of beziers to keep every chord within threshold of the curve."""
+        second = array[:, :-2] - 2 * array[:, 1:-1] + array[:, 2:]
+        bound = np.max(np.sqrt(np.sum(second * second, axis=2)), axis=1)  # pyright: ignore[reportAny]
+        chords = np.ceil(np.sqrt(0.75 * bound / threshold))
+
+        chord = array[:, 3] - array[:, 0]
+        chord_length = np.sqrt(np.sum(chord * chord, axis=1))  # pyright: ignore[reportAny]
+        direction = chord / np.where(chord_length > 0, chord_length, 1)[:, np.newaxis]
+        offsets = array[:, 1:3] - array[:, np.newaxis, 0]
+        along = np.sum(offsets * direction[:, np.newaxis], axis=2)  # pyright: ignore[reportAny]
+        across = offsets - along[:, :, np.newaxis] * direction[:, np.newaxis]
+        inside = np.all((along >= 0) & (along <= chord_length[:, np.newaxis]), axis=1)
+        flat = inside & (
+            np.max(np.sum(across * across, axis=2), axis=1) <= (threshold / 2) ** 2  # pyright: ignore[reportAny]
+        )
 
-        def estimator(samples: int = 8, last_length: float | None = None) -> int:
-            estimate = self.path(samples).length
-            if not last_length or np.abs(estimate - last_length) > threshold:
-                return estimator(samples * 2, estimate)
-            return samples
+        return np.where(flat, 0, np.maximum(chords - 1, minimum)).astype(np.int64)
 
-        return estimator()
+    def fit(self, threshold: float = 1e-1) -> int:
+        """Returns the number of samples needed to acheive the given error rate for this bezier."""
+        return int(self.flatness_samples(self.array[np.newaxis], threshold)[0])  # pyright: ignore[reportAny]
 
     def upoint(self, u: float) -> Vec:
         """Return for point on the bezier curve at the given u value."""
@@ -41,24 +95,43 @@ class Bezier:
         b = (a[1:] - a[:-1]) * u + a[:-1]
         return vec((b[1] - b[0]) * u + b[0])  # pyright: ignore[reportAny]
 
+    @staticmethod
+    def solve_x(
+        array: npt.NDArray[np.float64],
+        x: npt.NDArray[np.float64],
+        threshold: float = 1e-8,
+        iterations: int = 64,
+    ) -> tuple[npt.NDArray[np.float64], int]:
+        """Returns the u value at which each of an (M, 4, D) stack of beziers reaches the matching (M,) x value, and the iterations it took."""
+        p0, p1, p2, p3 = (array[:, i, 0] for i in range(4))
+        a = p3 - p0 + 3 * (p1 - p2)
+        b = 3 * (p0 - 2 * p1 + p2)
+        c = 3 * (p1 - p0)
+        d = p0 - x
+        rising = p3 >= p0
+
+        span = np.where(np.not_equal(p3, p0), p3 - p0, 1)
+        u: npt.NDArray[np.float64] = np.clip((x - p0) / span, 0, 1)
+        lo, hi = np.zeros_like(u), np.ones_like(u)
+        steps = 0
+        while steps < iterations:
+            fx: npt.NDArray[np.float64] = ((a * u + b) * u + c) * u + d
+            if np.all(np.abs(fx) <= threshold):
+                break
+            below = np.equal(fx < 0, rising)
+            lo = np.where(below, u, lo)
+            hi = np.where(below, hi, u)
+            dfdu: npt.NDArray[np.float64] = (3 * a * u + 2 * b) * u + c
+            with np.errstate(divide="ignore", invalid="ignore"):
+                newton: npt.NDArray[np.float64] = u - fx / dfdu
+            u = np.where((newton > lo) & (newton < hi), newton, (lo + hi) / 2)
+            steps += 1
+        return u, steps
+
     def xpoint(self, x: float, threshold: float = 1e-8) -> Vec:
         """Find a point on the bezier curve within threshold of the given x value."""
-        if np.isclose(x, self.array[0][0], rtol=1e-3):  # pyright: ignore[reportAny]
-            return Vec(self.array[0])  # pyright: ignore[reportAny]
-        if np.isclose(x, self.array[-1][0], rtol=1e-3):  # pyright: ignore[reportAny]
-            return Vec(self.array[-1])  # pyright: ignore[reportAny]
-
-        def estimator(u: float = 0.5) -> Vec:
-            point = self.upoint(u)
-            difference = point.x - x
-            if np.abs(difference) > threshold:
-                e = 1e-6
-                point_e = self.upoint(u + e)
-                dxdu = (point_e.x - point.x) / e
-                return estimator(np.clip(u - (difference / dxdu), 0, 1))  # pyright: ignore[reportAny]
-            return point
-
-        return estimator()
+        u, _ = self.solve_x(self.array[np.newaxis], np.array([x]), threshold)
+        return self.upoint(u[0])  # pyright: ignore[reportAny]
 
     @cached_property
     def x_extent(self) -> tuple[np.float64, np.float64]:
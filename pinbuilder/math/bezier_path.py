@@ -5,170 +5,267 @@ from functools import cached_property
 from typing import Self
 from .bezier import Bezier
 from .path import Path
-from .vectors import Vec2, Vec3
+from .svgd import parse_svgd
+from .affine import Affine
+from .vectors import Vec2
 
 
 class BezierPath:
-    def __init__(self, beziers: list[Bezier]) -> None:
-        self.beziers = beziers
+    knots: int = 16
+
+    def __init__(self, array: npt.NDArray[np.float64]) -> None:
+        """Create a BezierPath from an (N, 4, D) array of cubic bezier control points."""
+        self.array = array
 
     @classmethod
-    def from_svgd(cls, svgd: str, dimensions: Vec2, transform: Vec2) -> Self:
-        """Create a BezierPath from an SVG D attribute and associated data."""
-        tokens = deque(svgd.split(" "))
-        points: deque[Vec2] = deque()
-
-        def linear_control_points(p1: Vec2, p2: Vec2) -> tuple[Vec2, Vec2]:
-            return ((p2 - p1) / 4 + p1, (p2 - p1) / 4 * 3 + p1)
-
-        while len(tokens) > 0:
-            cmd = tokens.popleft()
-            match cmd:
-                case "M":
-                    p1 = Vec2.from_string_svgd(tokens.popleft(), dimensions, transform)
-                    points.append(p1)
-                case "L":
-                    p1 = points.pop()
-                    p2 = Vec2.from_string_svgd(tokens.popleft(), dimensions, transform)
-                    c1, c2 = linear_control_points(p1, p2)
-                    points.extend((p1, c1, c2, p2))
-                case "V":
-                    p1 = points.pop()
-                    p2 = Vec2.from_coords(
-                        p1.x, dimensions.y - (float(tokens.popleft()) + transform.y)
-                    )
-                    c1, c2 = linear_control_points(p1, p2)
-                    points.extend((p1, c1, c2, p2))
-                case "H":
-                    p1 = points.pop()
-                    p2 = Vec2.from_coords(float(tokens.popleft()) + transform.x, p1.y)
-                    c1, c2 = linear_control_points(p1, p2)
-                    points.extend((p1, c1, c2, p2))
-                case "C":
-                    c1 = Vec2.from_string_svgd(tokens.popleft(), dimensions, transform)
-                    c2 = Vec2.from_string_svgd(tokens.popleft(), dimensions, transform)
-                    p2 = Vec2.from_string_svgd(tokens.popleft(), dimensions, transform)
-                    points.extend((c1, c2, p2))
-                case "Z":
-                    p1 = points.pop()
-                    p2 = points.popleft()
-                    c1, c2 = linear_control_points(p1, p2)
-                    points.appendleft(p2)
-                    points.extend((p1, c1, c2, p2))
-                case _:
-                    raise ValueError(f"Unknown svgd command: {cmd}")
-        return cls.from_scad(Path.from_points(list(points)).scad)
+    def from_beziers(cls, beziers: list[Bezier]) -> Self:
+        return cls(np.stack([bezier.array for bezier in beziers]))
+
+    @classmethod
+    def from_points(cls, points: npt.NDArray[np.float64]) -> Self:
+        """Create a BezierPath from a (3N + 1, D) array of chained control points."""
+        segments = (len(points) - 1) // 3
+        return cls(points[np.arange(segments)[:, np.newaxis] * 3 + np.arange(4)])
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    @classmethod
+    def from_svgd(cls, svgd: str, dimensions: Vec2, transform: Affine) -> Self:
+        """Create a BezierPath from an SVG D attribute, mapping every control point through transform at once."""
+        points = transform.apply(parse_svgd(svgd))
+        points[:, 1] = dimensions.y - points[:, 1]
+        return cls.from_points(points)
 
     @classmethod
     def from_scad(cls, scad: str) -> Self:
         """Create a BezierPath from an SCAD bezpath array string."""
         point_strings = "".join(scad.split())[2:-2].split("],[")
-        vec_type = Vec2 if len(point_strings[0].split(",")) == 2 else Vec3
-        points = [vec_type.from_string(point_string) for point_string in point_strings]
-        beziers = [
-            Bezier.from_points(*points[i : i + 4]) for i in range(0, len(points) - 3, 3)
-        ]
-        return cls(beziers)
+        points = np.array([np.fromstring(point, sep=",") for point in point_strings])
+        return cls.from_points(points)
 
-    def path(self, samples: int | list[int] | npt.NDArray[np.int64]) -> Path:
-        """Returns a Path instance covering all segments at the given number of samples."""
-        if isinstance(samples, int):
-            return sum((bezier.path(samples) for bezier in self.beziers), Path())
-        if len(samples) != len(self.beziers):
+    @cached_property
+    def beziers(self) -> list[Bezier]:
+        """Returns a Bezier view onto each segment of this path."""
+        return [Bezier(segment) for segment in self.array]  # pyright: ignore[reportAny]
+
+    @cached_property
+    def points(self) -> npt.NDArray[np.float64]:
+        """Returns the (3N + 1, D) chained control points of this path."""
+        return np.concatenate(
+            (self.array[:, :3].reshape(-1, self.dims), self.array[-1, 3:])
+        )
+
+    @property
+    def dims(self) -> int:
+        return self.array.shape[2]  # pyright: ignore[reportAny]
+
+    def _samples(
+        self, samples: int | list[int] | npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        if isinstance(samples, (int, np.integer)):
+            return np.full(len(self.array), samples, dtype=np.int64)
+        if len(samples) != len(self.array):
             raise ValueError("Number of beziers doesn't match number of samples")
-        return sum(
-            (self.beziers[i].path(samples[i]) for i in range(len(samples))), Path()
+        return np.asarray(samples, dtype=np.int64)
+
+    def sample(
+        self, samples: int | list[int] | npt.NDArray[np.int64]
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+        """Returns every segment's sampled points, endpoints included, along with the point offset of each segment."""
+        counts = self._samples(samples) + 2
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        segment = np.repeat(np.arange(len(self.array)), counts)
+        total = int(offsets[-1])  # pyright: ignore[reportAny]
+        u = (np.arange(total) - offsets[segment]) / (counts[segment] - 1)
+        return Bezier.de_casteljau(self.array[segment], u), offsets
+
+    def parameters(
+        self, samples: int | list[int] | npt.NDArray[np.int64]
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Returns the segment and u value of every point path() produces at the given number of samples."""
+        counts = self._samples(samples) + 2
+        shared = np.concatenate(
+            ([False], np.all(np.equal(self.array[1:, 0], self.array[:-1, 3]), axis=1))
         )
+        kept = counts - shared
+        offsets = np.concatenate(([0], np.cumsum(kept)))
+        segment = np.repeat(np.arange(len(self.array)), kept)
+        total = int(offsets[-1])  # pyright: ignore[reportAny]
+        index = np.arange(total) - offsets[segment] + shared[segment]
+        return segment, index / (counts[segment] - 1)
+
+    def path(self, samples: int | list[int] | npt.NDArray[np.int64]) -> Path:
+        """Returns a Path instance covering all segments at the given number of samples."""
+        segment, u = self.parameters(samples)
+        return Path(Bezier.de_casteljau(self.array[segment], u))
 
-    def fits(self, threshold: float = 1e-2) -> npt.NDArray[np.int64]:
+    def fits(self, threshold: float = 1e-2, minimum: int = 16) -> npt.NDArray[np.int64]:
         """Returns the number of samples needed for each segment of the bezier path to achieve a given error distance."""
-        return np.array([bezier.fit(threshold) for bezier in self.beziers])
+        return Bezier.flatness_samples(self.array, threshold, minimum)
 
     def bezier_lengths(
         self, samples: int | list[int] | npt.NDArray[np.int64]
     ) -> npt.NDArray[np.float64]:
         """Returns the path length for each segment in the bezier path at the given number of samples."""
-        if isinstance(samples, int):
-            return np.array([beizer.path(samples).length for beizer in self.beziers])
-        if len(samples) != len(self.beziers):
-            raise ValueError("Number of beziers doesn't match number of samples")
-        return np.array(
-            [self.beziers[i].path(samples[i]).length for i in range(len(samples))]
-        )
+        points, offsets = self.sample(samples)
+        seg_vec = points[1:] - points[:-1]
+        distances = np.sqrt(np.sum(seg_vec * seg_vec, axis=1))  # pyright: ignore[reportAny]
+        distances[offsets[1:-1] - 1] = 0
+        return np.add.reduceat(distances, offsets[:-1])
 
     def length(self, samples: int | list[int] | npt.NDArray[np.int64]) -> float:
         """Returns the total length of this path at the given number of samples."""
-        return sum(self.bezier_lengths(samples))
+        return float(np.sum(self.bezier_lengths(samples)))
+
+    @cached_property
+    def arc_table(self) -> npt.NDArray[np.float64]:
+        """Returns the distance along the path at u = k / knots of each segment, ending with the total length."""
+        segments = len(self.array)
+        u0 = np.tile(np.arange(self.knots) / self.knots, segments)
+        spans = Bezier.arc_lengths(
+            np.repeat(self.array, self.knots, axis=0), u0, u0 + 1 / self.knots
+        )
+        return np.concatenate(([0], np.cumsum(spans)))
+
+    @property
+    def arc_length(self) -> float:
+        return float(self.arc_table[-1])  # pyright: ignore[reportAny]
+
+    def distance_at(
+        self, segment: npt.NDArray[np.int64], u: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Returns the distance along the path to each (segment, u) position."""
+        knot = np.minimum(np.floor(u * self.knots), self.knots - 1)
+        start = knot / self.knots
+        return self.arc_table[segment * self.knots + knot.astype(np.int64)] + (
+            Bezier.arc_lengths(self.array[segment], start, u)
+        )
+
+    def distance_to_u(
+        self, distances: npt.NDArray[np.float64], iterations: int = 3
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """Returns the segment and u value at each of the given distances along the path."""
+        table = self.arc_table
+        distances = np.clip(distances, 0, self.arc_length)
+        span = np.clip(
+            np.searchsorted(table, distances, side="right") - 1, 0, len(table) - 2
+        )
+        segment = span // self.knots
+        start = (span % self.knots) / self.knots
+        end = start + 1 / self.knots
+        width = table[span + 1] - table[span]
+        fraction = np.divide(
+            distances - table[span],
+            width,
+            out=np.zeros_like(distances),
+            where=width > 0,
+        )
+        u = start + fraction / self.knots
+
+        beziers = self.array[segment]
+        for _ in range(iterations):
+            error = table[span] + Bezier.arc_lengths(beziers, start, u) - distances
+            tangent = Bezier.derivative(beziers, u)
+            speed = np.sqrt(np.sum(tangent * tangent, axis=1))  # pyright: ignore[reportAny]
+            step = np.divide(error, speed, out=np.zeros_like(u), where=speed > 0)
+            u = np.clip(u - step, start, end)
+        return segment, u
+
+    def point_at_distance(
+        self, distances: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        """Returns the point at each of the given distances along the path."""
+        segment, u = self.distance_to_u(distances)
+        return Bezier.de_casteljau(self.array[segment], u)
+
+    @cached_property
+    def x_extents(self) -> npt.NDArray[np.float64]:
+        """Returns the (N, 2) interval of x values each segment spans."""
+        p12x = self.array[:, ::3, 0]
+        return np.stack((np.min(p12x, axis=1), np.max(p12x, axis=1)), axis=1)
 
     @cached_property
     def x_length(self) -> np.float64:
         """Return the total length over x for the bezier path."""
-        return np.sum([bezier.x_length for bezier in self.beziers])
+        return np.sum(self.x_extents[:, 1] - self.x_extents[:, 0])
 
-    def with_height(self, height: Self) -> Path:
-        """Stitch a 3D path using self as a basepath and the parameter as a function of height over distance."""
-        fits = self.fits()
-        basepath = self.path(fits)
-        ux = basepath.point_distances / basepath.length * height.x_length
-        x_extents = [bezier.x_extent[1] for bezier in height.beziers]
+    def ypoints(
+        self, x: npt.NDArray[np.float64], threshold: float = 1e-8
+    ) -> tuple[npt.NDArray[np.float64], int]:
+        """Returns the y value of this path at each of the given x values, for paths that advance along x, and the solver iterations it took."""
+        segment = np.clip(
+            np.searchsorted(self.x_extents[:, 1], x, side="left"), 0, len(self) - 1
+        )
+        beziers = self.array[segment]
+        u, steps = Bezier.solve_x(beziers, x, threshold)
+        return Bezier.de_casteljau(beziers, u)[:, 1], steps
 
-        def z_sample(ux: float) -> float:
-            bezier_i = np.searchsorted(x_extents, ux, side="left")
-            bezier = height.beziers[np.clip(bezier_i, 0, len(height.beziers) - 1)]
-            return bezier.xpoint(ux).y
+    def with_height(
+        self,
+        height: Self,
+        samples: int | list[int] | npt.NDArray[np.int64] | None = None,
+    ) -> tuple[Path, int]:
+        """Stitch a 3D path using self as a basepath and the parameter as a function of height over distance.
 
-        z_values = np.array([[z_sample(ux[i])] for i in range(len(basepath.array))])  # pyright: ignore[reportAny]
-        return Path(np.concatenate((basepath.array, z_values), axis=1))
+        Also returns how many iterations solving the height path for x took.
+        """
+        basepath = self.path(self.fits() if samples is None else samples)
+        ux = basepath.point_distances / basepath.length * height.x_length
+        z_values, steps = height.ypoints(ux)
+        return Path(
+            np.concatenate((basepath.array, z_values[:, np.newaxis]), axis=1)
+        ), steps
 
     @cached_property
     def scad(self) -> str:
         """Returns this bezier path as a string in BOSL-compatible SCAD bezpath array form."""
+        return Path(self.points).scad
 
-        def bezier_to_string(bezier: Bezier, points: int = 4) -> str:
-            return ",".join(str(point) for point in bezier.array[:points])  # pyright: ignore[reportAny]
-
-        def beziers_to_string(beziers: list[Bezier], points: int = 4) -> str:
-            return ",".join(bezier_to_string(bezier, points) for bezier in beziers)
-
-        return f"[{beziers_to_string(self.beziers[:-1], 3)},{bezier_to_string(self.beziers[-1])}]"
+    @cached_property
+    def line_kinds(self) -> npt.NDArray[np.bool_]:
+        """Returns (N, 3) flags marking each segment as a vertical line, horizontal line and line."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            units = self.array / np.linalg.norm(self.array, axis=2)[:, :, np.newaxis]  # pyright: ignore[reportAny]
+        is_line = np.all(np.isclose(units, units[:, :1], atol=1e-2), axis=(1, 2))
+        starts = self.array[:, :1]
+        is_vline = is_line & np.all(
+            np.isclose(starts[:, :, 0], self.array[:, :, 0], atol=1e-2), axis=1
+        )
+        is_hline = is_line & np.all(
+            np.isclose(starts[:, :, 1], self.array[:, :, 1], atol=1e-2), axis=1
+        )
+        return np.stack((is_vline, is_hline, is_line), axis=1)
 
-    def svgd(self, dimensions: Vec2, transform: Vec2) -> str:
+    def svgd(self, dimensions: Vec2, transform: Affine) -> str:
         """Returns the bezier path as a d attribute for use in SVGs."""
-        output: deque[str] = deque()
-
-        output.extend(("M", self.beziers[0].p1.to_string_svgd(dimensions, transform)))
-        for i, bezier in enumerate(self.beziers):
-            bezier_type = (
-                bezier.is_vline,
-                bezier.is_hline,
-                bezier.is_line,
-                i == len(self.beziers) - 1
-                and bezier.is_line
-                and bezier.p2 == self.beziers[0].p1,
-            )
-            match bezier_type:
+        points = Vec2.to_svgd_array(self.points, dimensions, transform)
+        coordinates: list[list[float]] = points.tolist()  # pyright: ignore[reportAny]
+        rounded = [f"{round(x, 4)},{round(y, 4)}" for x, y in coordinates]
+        segments = points[np.arange(len(self))[:, np.newaxis] * 3 + np.arange(4)]
+        straight = np.isclose(segments, segments[:, :1], atol=1e-2).all(axis=1)
+        is_line = self.line_kinds[:, 2]
+        flags = np.column_stack(
+            (is_line & straight[:, 0], is_line & straight[:, 1], is_line)
+        )
+        kinds: list[list[bool]] = flags.tolist()  # pyright: ignore[reportAny]
+        closes = bool(np.array_equal(self.array[-1, 3], self.array[0, 0]))  # pyright: ignore[reportAny]
+
+        output: deque[str] = deque(("M", rounded[0]))
+        for i, (is_vline, is_hline, is_line) in enumerate(kinds):
+            end = 3 * i + 3
+            match (is_vline, is_hline, is_line, i == len(kinds) - 1 and closes):
                 case (True, _, _, False):
-                    output.extend(
-                        ("V", str(bezier.p2.to_svgd(dimensions, transform).y))
-                    )
+                    output.extend(("V", str(coordinates[end][1])))
                 case (_, True, _, False):
-                    output.extend(
-                        ("H", str(bezier.p2.to_svgd(dimensions, transform).x))
-                    )
+                    output.extend(("H", str(coordinates[end][0])))
                 case (_, _, True, False):
-                    output.extend(
-                        ("L", bezier.p2.to_string_svgd(dimensions, transform))
-                    )
+                    output.extend(("L", rounded[end]))
                 case (_, _, True, True):
-                    output.extend(("Z"))
+                    output.append("Z")
                 case _:
                     output.extend(
-                        (
-                            "C",
-                            bezier.c1.to_string_svgd(dimensions, transform),
-                            bezier.c2.to_string_svgd(dimensions, transform),
-                            bezier.p2.to_string_svgd(dimensions, transform),
-                        )
+                        ("C", rounded[end - 2], rounded[end - 1], rounded[end])
                     )
 
-        return " ".join(list(output))
+        return " ".join(output)
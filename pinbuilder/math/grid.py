@@ -0,0 +1,58 @@
+import numpy as np
+import numpy.typing as npt
+from collections import defaultdict
+
+
+class GridIndex:
+    """A uniform grid over axis-aligned 2D boxes for finding which boxes overlap a query box.
+
+    Each box is registered in every cell it touches, so a query only looks at the boxes
+    sharing a cell with it instead of every box in the index.
+    """
+
+    def __init__(
+        self, boxes: npt.NDArray[np.float64], cell: float | None = None
+    ) -> None:
+        """Index an (N, 4) array of [xmin, ymin, xmax, ymax] boxes."""
+        self.boxes = boxes
+        if cell is None:
+            sizes: npt.NDArray[np.float64] = np.maximum(boxes[:, 2:] - boxes[:, :2], 0)
+            cell = float(np.median(np.max(sizes, axis=1))) if len(boxes) > 0 else 1.0
+        self.cell = max(cell, 1e-6)
+        self.cells: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+
+        low, high = self.cell_range(boxes)
+        lows: list[list[int]] = low.tolist()  # pyright: ignore[reportAny]
+        highs: list[list[int]] = high.tolist()  # pyright: ignore[reportAny]
+        for i, ((x0, y0), (x1, y1)) in enumerate(zip(lows, highs)):
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self.cells[(x, y)].append(i)
+
+    def cell_range(
+        self, boxes: npt.NDArray[np.float64]
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        return (
+            np.floor(boxes[:, :2] / self.cell).astype(np.int64),
+            np.floor(boxes[:, 2:] / self.cell).astype(np.int64),
+        )
+
+    def query(self, box: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+        """Returns the indices of every indexed box overlapping the [xmin, ymin, xmax, ymax] box."""
+        low, high = self.cell_range(box[np.newaxis])
+        corners: list[list[int]] = np.concatenate((low, high)).tolist()  # pyright: ignore[reportAny]
+        (x0, y0), (x1, y1) = corners
+        candidates = {
+            i
+            for x in range(x0, x1 + 1)
+            for y in range(y0, y1 + 1)
+            for i in self.cells.get((x, y), ())
+        }
+        if not candidates:
+            return np.array([], dtype=np.int64)
+        found = np.fromiter(candidates, dtype=np.int64)
+        boxes = self.boxes[found]
+        overlap = np.all(boxes[:, :2] <= box[2:], axis=1) & np.all(
+            boxes[:, 2:] >= box[:2], axis=1
+        )
+        return np.sort(found[overlap])
@@ -2,7 +2,8 @@ import numpy as np
 import numpy.typing as npt
 from functools import cached_property
 from typing import Self, override
-from .vectors import Vec, Vec2, Vec3
+from ..scad import ScadWriter
+from .vectors import Vec
 
 
 class Path:
@@ -45,6 +46,45 @@ class Path:
     @cached_property
     def scad(self) -> str:
         """Returns this Path as a string in SCAD-compatible array form."""
-        vec_class = Vec2 if len(self.array[0]) == 2 else Vec3  # pyright: ignore[reportAny]
-        points = ",".join([str(vec_class(point)) for point in self.array])  # pyright: ignore[reportAny]
-        return f"[{points}]"
+        return ScadWriter.render(lambda writer: writer.array(self.array))
+
+    @staticmethod
+    def simplify(
+        points: npt.NDArray[np.float64], tolerance: float
+    ) -> npt.NDArray[np.int64]:
+        """Returns the indices of the (N, D) points Douglas-Peucker keeps within tolerance.
+
+        Every open span between kept points is split at once on each pass, at its point
+        farthest from the chord, so the number of passes grows with the depth of the
+        splitting rather than with the number of points kept. The ends are always kept.
+        """
+        count = len(points)
+        keep = np.zeros(count, dtype=np.bool_)
+        keep[[0, -1]] = True
+        index = np.arange(count)
+        while True:
+            before = np.maximum.accumulate(np.where(keep, index, 0))
+            after = np.minimum.accumulate(np.where(keep, index, count - 1)[::-1])[::-1]
+            a, b = points[before], points[after]
+            chord = b - a
+            length = np.sum(chord * chord, axis=1)  # pyright: ignore[reportAny]
+            offset = points - a
+            t = np.divide(
+                np.sum(offset * chord, axis=1),  # pyright: ignore[reportAny]
+                length,
+                out=np.zeros(count),
+                where=length > 0,
+            )
+            error = offset - np.clip(t, 0, 1)[:, np.newaxis] * chord
+            distance = np.sqrt(np.sum(error * error, axis=1))  # pyright: ignore[reportAny]
+            distance[keep] = 0
+
+            # The farthest point of each span, ties going to the first.
+            order = np.lexsort((-distance, before))
+            first = order[
+                np.concatenate(([True], before[order][1:] != before[order][:-1]))
+            ]
+            split = first[distance[first] > tolerance]
+            if len(split) == 0:
+                return np.flatnonzero(keep)
+            keep[split] = True
@@ -0,0 +1,212 @@
+import math
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+COMMANDS = "MmZzLlHhVvCcSsQqTtAa"
+TOKEN = re.compile(
+    r"([MmZzLlHhVvCcSsQqTtAa])|([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|([^\s,])"
+)
+
+
+def parse_svgd(svgd: str) -> "npt.NDArray[np.float64]":
+    """Parses an SVG path d attribute into a (3N + 1, 2) array of chained cubic bezier control points."""
+    import numpy as np
+
+    return np.array(svgd_points(svgd), dtype=np.float64).reshape(-1, 2)
+
+
+def svgd_points(svgd: str) -> list[tuple[float, float]]:
+    """Parses an SVG path d attribute into chained cubic bezier control points, without NumPy.
+
+    Coordinates are left in SVG user space. Lines are stored as cubics with control
+    points at a quarter and three quarters of the way along, quadratics and arcs are
+    converted to exact or best-fit cubics, and additional subpaths are joined to the
+    previous one with a line segment.
+    """
+    tokens: list[str] = []
+    for match in TOKEN.finditer(svgd):
+        if match.group(3) is not None:
+            raise ValueError(
+                f"Unexpected {match.group(3)!r} in svgd at {match.start()}: {svgd!r}"
+            )
+        tokens.append(match.group(0))
+
+    points: list[tuple[float, float]] = []
+    current = start = (0.0, 0.0)
+    control: tuple[float, float] | None = None
+    previous = ""
+    i = 0
+
+    def cubic(
+        c1: tuple[float, float], c2: tuple[float, float], p2: tuple[float, float]
+    ) -> None:
+        nonlocal current
+        if not points:
+            points.append(current)
+        points.extend((c1, c2, p2))
+        current = p2
+
+    def line(p2: tuple[float, float]) -> None:
+        (x1, y1), (x2, y2) = current, p2
+        dx, dy = (x2 - x1) / 4, (y2 - y1) / 4
+        cubic((dx + x1, dy + y1), (dx * 3 + x1, dy * 3 + y1), p2)
+
+    def number() -> float:
+        nonlocal i
+        if i == len(tokens) or tokens[i] in COMMANDS:
+            raise ValueError(f"Expected number in svgd at token {i}: {svgd!r}")
+        i += 1
+        return float(tokens[i - 1])
+
+    def flag() -> bool:
+        # Flags are a single digit and may be packed against what follows, as in "0110".
+        nonlocal i
+        token = tokens[i] if i < len(tokens) else ""
+        if token[:1] not in ("0", "1"):
+            raise ValueError(f"Expected flag in svgd at token {i}: {svgd!r}")
+        if len(token) > 1:
+            tokens[i] = token[1:]
+        else:
+            i += 1
+        return token[0] == "1"
+
+    cmd = ""
+    while i < len(tokens):
+        if tokens[i] in COMMANDS:
+            cmd = tokens[i]
+            i += 1
+        elif cmd in ("", "Z", "z"):
+            raise ValueError(f"Unknown svgd command at token {i}: {svgd!r}")
+        elif cmd in ("M", "m"):
+            cmd = "L" if cmd == "M" else "l"
+
+        upper = cmd.upper()
+        ox, oy = (0.0, 0.0) if cmd == upper else current
+
+        match upper:
+            case "M":
+                target = (number() + ox, number() + oy)
+                if points:
+                    line(target)
+                current = start = target
+            case "L":
+                line((number() + ox, number() + oy))
+            case "H":
+                line((number() + ox, current[1]))
+            case "V":
+                line((current[0], number() + oy))
+            case "C":
+                c1 = (number() + ox, number() + oy)
+                c2 = (number() + ox, number() + oy)
+                cubic(c1, c2, (number() + ox, number() + oy))
+            case "S":
+                c1 = reflect(control, current) if previous in ("C", "S") else current
+                c2 = (number() + ox, number() + oy)
+                cubic(c1, c2, (number() + ox, number() + oy))
+            case "Q" | "T":
+                if upper == "Q":
+                    q = (number() + ox, number() + oy)
+                else:
+                    q = reflect(control, current) if previous in ("Q", "T") else current
+                p0, p2 = current, (number() + ox, number() + oy)
+                cubic(
+                    (p0[0] + (q[0] - p0[0]) * 2 / 3, p0[1] + (q[1] - p0[1]) * 2 / 3),
+                    (p2[0] + (q[0] - p2[0]) * 2 / 3, p2[1] + (q[1] - p2[1]) * 2 / 3),
+                    p2,
+                )
+                control = q
+            case "A":
+                rx, ry, phi = number(), number(), number()
+                large, sweep = flag(), flag()
+                p2 = (number() + ox, number() + oy)
+                segments = arc(current, rx, ry, phi, large, sweep, p2)
+                if segments is None:
+                    line(p2)
+                else:
+                    for c1, c2, p in segments:
+                        cubic(c1, c2, p)
+            case "Z":
+                line(start)
+
+        if upper in ("C", "S"):
+            control = points[-2]
+        previous = upper
+
+    return points
+
+
+def reflect(
+    control: tuple[float, float] | None, point: tuple[float, float]
+) -> tuple[float, float]:
+    """Reflects the previous control point about the current point for S and T commands."""
+    if control is None:
+        return point
+    return (2 * point[0] - control[0], 2 * point[1] - control[1])
+
+
+def arc(
+    p1: tuple[float, float],
+    rx: float,
+    ry: float,
+    phi: float,
+    large: bool,
+    sweep: bool,
+    p2: tuple[float, float],
+) -> list[tuple[tuple[float, float], ...]] | None:
+    """Converts an SVG elliptical arc into cubic beziers of at most a quarter turn each.
+
+    Returns None when the arc degenerates into a straight line.
+    """
+    if p1 == p2:
+        return []
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        return None
+
+    cos, sin = math.cos(math.radians(phi)), math.sin(math.radians(phi))
+    dx, dy = (p1[0] - p2[0]) / 2, (p1[1] - p2[1]) / 2
+    x1, y1 = cos * dx + sin * dy, -sin * dx + cos * dy
+
+    scale = x1 * x1 / (rx * rx) + y1 * y1 / (ry * ry)
+    if scale > 1:
+        rx, ry = rx * math.sqrt(scale), ry * math.sqrt(scale)
+
+    numerator = rx * rx * ry * ry - rx * rx * y1 * y1 - ry * ry * x1 * x1
+    denominator = rx * rx * y1 * y1 + ry * ry * x1 * x1
+    coef = math.sqrt(max(0.0, numerator / denominator))
+    if large == sweep:
+        coef = -coef
+    cx1, cy1 = coef * rx * y1 / ry, -coef * ry * x1 / rx
+    cx = cos * cx1 - sin * cy1 + (p1[0] + p2[0]) / 2
+    cy = sin * cx1 + cos * cy1 + (p1[1] + p2[1]) / 2
+
+    theta = math.atan2((y1 - cy1) / ry, (x1 - cx1) / rx)
+    delta = math.atan2((-y1 - cy1) / ry, (-x1 - cx1) / rx) - theta
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+
+    count = max(1, math.ceil(abs(delta) / (math.pi / 2) - 1e-9))
+    step = delta / count
+    k = 4 / 3 * math.tan(step / 4)
+
+    def point(t: float) -> tuple[float, float]:
+        ex, ey = rx * math.cos(t), ry * math.sin(t)
+        return (cos * ex - sin * ey + cx, sin * ex + cos * ey + cy)
+
+    def tangent(t: float) -> tuple[float, float]:
+        ex, ey = -rx * math.sin(t) * k, ry * math.cos(t) * k
+        return (cos * ex - sin * ey, sin * ex + cos * ey)
+
+    segments: list[tuple[tuple[float, float], ...]] = []
+    for i in range(count):
+        t1, t2 = theta + step * i, theta + step * (i + 1)
+        a, b = point(t1), point(t2) if i < count - 1 else p2
+        da, db = tangent(t1), tangent(t2)
+        segments.append(((a[0] + da[0], a[1] + da[1]), (b[0] - db[0], b[1] - db[1]), b))
+    return segments
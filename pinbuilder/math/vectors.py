@@ -1,37 +1,50 @@
-import numpy as np
-import numpy.typing as npt
-from typing import Any, Self, override
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Self, override
+from .affine import Affine
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 
 class Vec:
-    def __init__(self, array: npt.NDArray[np.float64]) -> None:
-        self.array = array
+    __slots__ = ("coords",)
+
+    def __init__(self, array: Iterable[float]) -> None:
+        self.coords: tuple[float, ...] = tuple(map(float, array))
 
     @classmethod
     def from_string(cls, raw: str) -> Self:
-        return cls(np.fromstring(raw, sep=","))
+        return cls(map(float, raw.split(",")))
 
     def __add__(self, other: Self) -> Self:
-        return self.__class__(self.array + other.array)
+        return self.__class__([a + b for a, b in zip(self.coords, other.coords)])
 
     def __sub__(self, other: Self) -> Self:
-        return self.__class__(self.array - other.array)
+        return self.__class__([a - b for a, b in zip(self.coords, other.coords)])
 
     def __truediv__(self, other: float) -> Self:
-        return self.__class__(self.array / other)
+        return self.__class__([a / other for a in self.coords])
 
     def __mul__(self, other: float) -> Self:
-        return self.__class__(self.array * other)
+        return self.__class__([a * other for a in self.coords])
 
     @override
     def __eq__(self, other: object) -> bool:
         if isinstance(other, self.__class__):
-            return np.array_equal(self.array, other.array)
+            return self.coords == other.coords
         return False
 
+    @property
+    def array(self) -> "npt.NDArray[np.float64]":
+        import numpy as np
+
+        return np.array(self.coords, dtype=np.float64)
+
     @property
     def length(self) -> float:
-        return np.sqrt(self.array.dot(self.array))  # pyright: ignore[reportAny]
+        return math.hypot(*self.coords)
 
     @override
     def __repr__(self) -> str:
@@ -39,19 +52,19 @@ class Vec:
 
     @override
     def __str__(self) -> str:
-        return "[" + ",".join([str(np.round(v, 4)) for v in self.array]) + "]"  # pyright: ignore[reportAny,reportUnknownArgumentType]
+        return "[" + ",".join([str(round(v, 4)) for v in self.coords]) + "]"
 
     @property
     def x(self) -> float:
-        return self.array[0]  # pyright: ignore[reportAny]
+        return self.coords[0]
 
     @property
     def y(self) -> float:
-        return self.array[1]  # pyright: ignore[reportAny]
+        return self.coords[1]
 
     @property
     def z(self) -> float:
-        return self.array[2]  # pyright: ignore[reportAny]
+        return self.coords[2]
 
     def to_svgd(self, dimensions: Any, transform: Any) -> Self:  # pyright: ignore[reportAny]
         return self
@@ -61,31 +74,40 @@ class Vec:
 
 
 class Vec2(Vec):
-    def __init__(self, array: npt.NDArray[np.float64]) -> None:
-        super().__init__(array)
+    __slots__ = ()
 
     @classmethod
     def from_coords(cls, x: float = 0, y: float = 0) -> Self:
-        return cls(np.array([x, y], dtype=np.float64))
+        return cls((x, y))
 
     @classmethod
-    def from_string_svgd(cls, raw: str, dimensions: Self, transform: Self) -> Self:
-        original = cls.from_string(raw) + transform
-        return cls.from_coords(original.x, dimensions.y - original.y)
+    def from_string_svgd(cls, raw: str, dimensions: Self, transform: Affine) -> Self:
+        x, y = transform.point(*cls.from_string(raw).coords)
+        return cls.from_coords(x, dimensions.y - y)
+
+    @staticmethod
+    def to_svgd_array(
+        array: "npt.NDArray[np.float64]", dimensions: "Vec2", transform: Affine
+    ) -> "npt.NDArray[np.float64]":
+        """Maps an (N, 2) array of playfield points back into SVG coordinates in one pass."""
+        import numpy as np
+
+        return transform.inverse.apply(
+            np.column_stack((array[:, 0], dimensions.y - array[:, 1]))
+        )
 
     @override
-    def to_svgd(self, dimensions: Self, transform: Self) -> Self:
-        return self.__class__.from_coords(self.x, dimensions.y - self.y) - transform
+    def to_svgd(self, dimensions: Self, transform: Affine) -> Self:
+        return self.__class__(transform.inverse.point(self.x, dimensions.y - self.y))
 
     @override
-    def to_string_svgd(self, dimensions: Self, transform: Self) -> str:
+    def to_string_svgd(self, dimensions: Self, transform: Affine) -> str:
         return str(self.to_svgd(dimensions, transform))[1:-1]
 
 
 class Vec3(Vec):
-    def __init__(self, array: npt.NDArray[np.float64]) -> None:
-        super().__init__(array)
+    __slots__ = ()
 
     @classmethod
     def from_coords(cls, x: float = 0, y: float = 0, z: float = 0) -> Self:
-        return cls(np.array([x, y, z], dtype=np.float64))
+        return cls((x, y, z))
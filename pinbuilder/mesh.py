@@ -0,0 +1,185 @@
+import zipfile
+import numpy as np
+import numpy.typing as npt
+from pathlib import Path
+from typing import Self
+
+
+class Mesh:
+    """A triangle mesh built directly from swept profiles, for export without OpenSCAD."""
+
+    def __init__(
+        self, vertices: npt.NDArray[np.float64], faces: npt.NDArray[np.int64]
+    ) -> None:
+        self.vertices = vertices
+        self.faces = faces
+
+    @staticmethod
+    def triangulate(polygon: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+        """Returns the (K - 2, 3) ear-clipped triangulation of a simple (K, 2) polygon, wound the same way as the polygon."""
+        x, y = polygon[:, 0], polygon[:, 1]
+        area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        remaining = (
+            list(range(len(polygon)))
+            if area > 0
+            else list(reversed(range(len(polygon))))
+        )
+
+        def cross(a: int, b: int, c: int) -> float:
+            (ax, ay), (bx, by), (cx, cy) = polygon[a], polygon[b], polygon[c]  # pyright: ignore[reportAny]
+            return float((bx - ax) * (cy - ay) - (by - ay) * (cx - ax))  # pyright: ignore[reportAny]
+
+        triangles: list[tuple[int, int, int]] = []
+        while len(remaining) > 3:
+            for i in range(len(remaining)):
+                a, b, c = (
+                    remaining[i - 1],
+                    remaining[i],
+                    remaining[(i + 1) % len(remaining)],
+                )
+                if cross(a, b, c) <= 0:
+                    continue
+                if any(
+                    cross(a, b, p) >= 0 and cross(b, c, p) >= 0 and cross(c, a, p) >= 0
+                    for p in remaining
+                    if p not in (a, b, c)
+                ):
+                    continue
+                triangles.append((a, b, c))
+                del remaining[i]
+                break
+            else:
+                raise ValueError("Profile is not a simple polygon!")
+        triangles.append((remaining[0], remaining[1], remaining[2]))
+        faces = np.array(triangles, dtype=np.int64)
+        return faces if area > 0 else faces[:, ::-1]
+
+    @classmethod
+    def sweep(
+        cls,
+        profile: npt.NDArray[np.float64],
+        path: npt.NDArray[np.float64],
+        scales: npt.NDArray[np.float64],
+    ) -> Self:
+        """Sweep a closed (K, 2) profile along an (M, 3) path with per-station (M, 2) scales.
+
+        Mirrors BOSL2 path_sweep with method="manual" and normal=UP: the profile's x axis
+        points to the right of travel in the playfield plane and its y axis is UP tilted to
+        stay perpendicular to the path tangent.
+        """
+        tangents = np.gradient(path, axis=0)
+        tangents /= np.maximum(np.linalg.norm(tangents, axis=1), 1e-12)[:, np.newaxis]
+        right = np.cross(tangents, np.array([0.0, 0.0, 1.0]))
+        right /= np.maximum(np.linalg.norm(right, axis=1), 1e-12)[:, np.newaxis]
+        up = np.cross(right, tangents)
+
+        px = profile[np.newaxis, :, 0] * scales[:, 0, np.newaxis]
+        py = profile[np.newaxis, :, 1] * scales[:, 1, np.newaxis]
+        vertices = (
+            path[:, np.newaxis]
+            + px[:, :, np.newaxis] * right[:, np.newaxis]
+            + py[:, :, np.newaxis] * up[:, np.newaxis]
+        )
+
+        stations, sides = len(path), len(profile)
+        ring = np.arange(sides)
+        base = (np.arange(stations - 1) * sides)[:, np.newaxis]
+        a, b = base + ring, base + np.roll(ring, -1)
+        c, d = b + sides, a + sides
+        walls = np.concatenate(
+            (np.stack((a, b, c), axis=-1), np.stack((a, c, d), axis=-1))
+        ).reshape(-1, 3)
+
+        cap = cls.triangulate(profile)
+        faces = np.concatenate((walls, cap[:, ::-1], cap + (stations - 1) * sides))
+        mesh = cls(vertices.reshape(-1, 3), faces)
+        if mesh.volume < 0:
+            mesh.faces = mesh.faces[:, ::-1]
+        return mesh
+
+    @classmethod
+    def merge(cls, meshes: list[Self]) -> Self:
+        """Combine meshes into one without welding or boolean operations."""
+        offsets = np.cumsum([0] + [len(mesh.vertices) for mesh in meshes])
+        return cls(
+            np.concatenate([mesh.vertices for mesh in meshes]),
+            np.concatenate([mesh.faces + offsets[i] for i, mesh in enumerate(meshes)]),
+        )
+
+    @property
+    def triangles(self) -> npt.NDArray[np.float64]:
+        return self.vertices[self.faces]
+
+    @property
+    def volume(self) -> float:
+        """Returns the signed volume enclosed by the mesh, positive when faces wind outward."""
+        t = self.triangles
+        return float(np.sum(np.cross(t[:, 0], t[:, 1]) * t[:, 2]) / 6)
+
+    def write_stl(self, path: Path) -> None:
+        """Write the mesh as a binary STL."""
+        triangles = self.triangles
+        normals = np.cross(
+            triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+        )
+        normals /= np.maximum(np.linalg.norm(normals, axis=1), 1e-12)[:, np.newaxis]
+
+        records = np.zeros(
+            len(triangles),
+            dtype=np.dtype(
+                [
+                    ("normal", "<f4", (3,)),
+                    ("vertices", "<f4", (3, 3)),
+                    ("attributes", "<u2"),
+                ]
+            ),
+        )
+        records["normal"] = normals
+        records["vertices"] = triangles
+        with open(path, "wb") as file:
+            _ = file.write(b"pinbuilder".ljust(80, b"\0"))
+            _ = file.write(np.uint32(len(records)).tobytes())
+            _ = file.write(records.tobytes())
+
+    @classmethod
+    def write_3mf(cls, path: Path, meshes: dict[str, Self], precision: int = 4) -> None:
+        """Write meshes as separate named objects of a 3MF package."""
+        vertex = f'<vertex x="%.{precision}f" y="%.{precision}f" z="%.{precision}f"/>'
+        triangle = '<triangle v1="%d" v2="%d" v3="%d"/>'
+        objects: list[str] = []
+        items: list[str] = []
+        for i, (name, mesh) in enumerate(meshes.items(), start=1):
+            vertices = (vertex * len(mesh.vertices)) % tuple(
+                mesh.vertices.ravel().tolist()
+            )
+            faces = (triangle * len(mesh.faces)) % tuple(mesh.faces.ravel().tolist())
+            objects.append(
+                f'<object id="{i}" name="{name}" type="model"><mesh>'
+                f"<vertices>{vertices}</vertices><triangles>{faces}</triangles>"
+                "</mesh></object>"
+            )
+            items.append(f'<item objectid="{i}"/>')
+
+        model = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<model unit="millimeter" xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">'
+            f"<resources>{''.join(objects)}</resources><build>{''.join(items)}</build></model>"
+        )
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+            package.writestr(
+                "[Content_Types].xml",
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+                "</Types>",
+            )
+            package.writestr(
+                "_rels/.rels",
+                '<?xml version="1.0" encoding="UTF-8"?>'
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                '<Relationship Target="/3D/3dmodel.model" Id="rel0" '
+                'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+                "</Relationships>",
+            )
+            package.writestr("3D/3dmodel.model", model)
@@ -1,19 +1,39 @@
+import hashlib
+from collections.abc import Iterable
+from functools import cached_property
 from typing import Self
 import numpy as np
 import numpy.typing as npt
-from itertools import pairwise
 
+from ..svg.feature_index import FeatureIndex
 from ..svg.features import Feature, RampPath, RampWidth, RampHeight
+from ..math.bezier_path import BezierPath
 from ..math.path import Path
+from ..mesh import Mesh
+from ..profiler import Profiler
+from ..scad import ScadWriter
+from .ramp_geometry import RampGeometry
+from .ramp_parts import RampParts
 
 
 class Ramp:
+    features = RampParts.features
+
     def __init__(
-        self, basepath: RampPath, widths: list[RampWidth], heightpath: RampHeight
+        self,
+        basepath: RampPath,
+        widths: list[RampWidth],
+        heightpath: RampHeight,
+        tolerance: float = 1e-2,
     ):
         self.basepath = basepath
         self.widths = widths
         self.heightpath = heightpath
+        self.tolerance = tolerance
+
+    def invalidate(self) -> None:
+        """Drops the cached geometry so it is rebuilt from the current source features."""
+        self.__dict__.pop("geometry", None)
 
     @staticmethod
     def cross_section_box(
@@ -117,40 +137,84 @@ class Ramp:
         )
 
     @classmethod
-    def collate_ramps(cls, features: list[Feature]) -> dict[str, Self]:
-        basepaths = {f.id: f for f in features if isinstance(f, RampPath)}
-        widths = {
-            k: sorted(
-                [w for w in features if isinstance(w, RampWidth) and w.id == k],
-                key=lambda x: x.index,
-            )
-            for k in basepaths.keys()
-        }
-        heightpaths = {hp.id: hp for hp in features if isinstance(hp, RampHeight)}
+    def collate_ramps(
+        cls, features: Iterable[Feature], tolerance: float = 1e-2
+    ) -> dict[str, Self]:
+        index = (
+            features if isinstance(features, FeatureIndex) else FeatureIndex(features)
+        )
         return {
-            k: cls(basepaths[k], widths[k], heightpaths[k]) for k in basepaths.keys()
+            k: cls(*parts, tolerance=tolerance)
+            for k, parts in RampParts.collate(index).items()
         }
 
+    problems = staticmethod(RampParts.problems)
+
     @property
     def has_widths(self) -> bool:
         if self.basepath.bezierpath is None:
             return False
-        return len(self.widths) == len(self.basepath.bezierpath.beziers) + 1
+        return len(self.widths) == len(self.basepath.bezierpath) + 1
 
     @property
-    def has_heightpath(self) -> bool:
-        if self.basepath.bezierpath is None or self.heightpath.bezierpath is None:
-            return False
+    def digest(self) -> str:
+        """Returns a hash of every input the ramp's geometry is computed from."""
+        digest = hashlib.sha256(f"{self.tolerance!r}\n".encode())
+        for feature in [self.basepath, *self.widths, self.heightpath]:
+            digest.update(
+                f"{feature.svgd};{feature.transform.coords};{feature.dimensions.coords}\n".encode()
+            )
+        return digest.hexdigest()
 
-        fits = self.basepath.bezierpath.fits()
+    @property
+    def sources(self) -> tuple[BezierPath, list[BezierPath], BezierPath]:
+        """Returns the base, width and height paths the ramp's geometry is built from."""
+        with Profiler.stage("from_svgd", self.basepath.id):
+            basepath = self.basepath.bezierpath
+            heightpath = self.heightpath.bezierpath
+            widths = [w.bezierpath for w in self.widths if w.bezierpath is not None]
+        if basepath is None or heightpath is None:
+            raise ValueError("Missing path!")
+        if len(widths) != len(self.widths):
+            raise ValueError("Missing width path!")
+        if not self.has_widths:
+            raise ValueError(
+                f"Ramp '{self.basepath.id}' has {len(widths)} RampWidths for {len(basepath) + 1} ends"
+            )
+        return basepath, widths, heightpath
 
-        print(
-            f"{self.basepath.bezierpath.length(fits)} == {self.heightpath.bezierpath.x_length}"
+    @property
+    def payload(
+        self,
+    ) -> tuple[
+        npt.NDArray[np.float64],
+        list[npt.NDArray[np.float64]],
+        npt.NDArray[np.float64],
+        float,
+    ]:
+        """Returns the ramp's source control point arrays and tolerance for shipping to a worker process."""
+        basepath, widths, heightpath = self.sources
+        return (
+            basepath.array,
+            [width.array for width in widths],
+            heightpath.array,
+            self.tolerance,
         )
 
+    @cached_property
+    def geometry(self) -> RampGeometry:
+        sources = self.sources
+        with Profiler.stage("geometry", self.basepath.id):
+            return RampGeometry.build(*sources, self.tolerance)
+
+    @property
+    def has_heightpath(self) -> bool:
+        if self.basepath.bezierpath is None or self.heightpath.bezierpath is None:
+            return False
+
         return bool(
             np.isclose(
-                self.basepath.bezierpath.length(fits),
+                self.geometry.length,
                 self.heightpath.bezierpath.x_length,
                 atol=1e-3,
             )
@@ -160,44 +224,37 @@ class Ramp:
     def is_valid(self) -> bool:
         return self.has_widths and self.has_heightpath
 
+    def sweep(self, writer: ScadWriter, cross_section: Path) -> None:
+        geometry = self.geometry
+        with Profiler.stage("scad", self.basepath.id):
+            writer.text("\n        path_sweep(")
+            writer.array(cross_section.array)
+            writer.text(", path3d(")
+            writer.array(geometry.path.array)
+            writer.text('), method = "manual", normal = UP, scale=')
+            writer.array(geometry.scales.array)
+            writer.text(", relaxed=true);\n        ")
+
+    def write_scad(self, writer: ScadWriter) -> None:
+        self.sweep(writer, self.cross_section_box(w=self.geometry.width / 2))
+
+    def write_scad_cutter(self, writer: ScadWriter) -> None:
+        self.sweep(writer, self.cross_section_inner_right(w=self.geometry.width / 2))
+
     @property
-    def scad(self) -> str:
-        if self.basepath.bezierpath is None or self.heightpath.bezierpath is None:
-            raise ValueError("Missing path!")
+    def mesh(self) -> Mesh:
+        geometry = self.geometry
+        with Profiler.stage("mesh", self.basepath.id):
+            return Mesh.sweep(
+                self.cross_section_box(w=geometry.width / 2).array,
+                geometry.path.array,
+                geometry.scales.array,
+            )
 
-        path = self.basepath.bezierpath.with_height(self.heightpath.bezierpath)
-        fits = self.basepath.bezierpath.fits()
-        width_samples = [w.bezierpath.length(1) for w in self.widths]
-        widths = np.concatenate(
-            [
-                np.linspace(start, end, fits[i] + 1)
-                for i, (start, end) in enumerate(pairwise(width_samples))
-            ]
-        )
-        x_scales = widths / widths[0]
-        scales = Path(np.array([[xs, 1] for xs in x_scales] + [[x_scales[-1], 1]]))
-        cross_section = self.cross_section_box(w=widths[0] / 2)
-        return f"""
-        path_sweep({cross_section.scad}, path3d(path_merge_collinear({path.scad})), method = "manual", normal = UP, scale={scales.scad}, relaxed=true);
-        """
+    @property
+    def scad(self) -> str:
+        return ScadWriter.render(self.write_scad)
 
     @property
     def scad_cutter(self) -> str:
-        if self.basepath.bezierpath is None or self.heightpath.bezierpath is None:
-            raise ValueError("Missing path!")
-
-        path = self.basepath.bezierpath.with_height(self.heightpath.bezierpath)
-        fits = self.basepath.bezierpath.fits()
-        width_samples = [w.bezierpath.length(1) for w in self.widths]
-        widths = np.concatenate(
-            [
-                np.linspace(start, end, fits[i] + 1)
-                for i, (start, end) in enumerate(pairwise(width_samples))
-            ]
-        )
-        x_scales = widths / widths[0]
-        scales = Path(np.array([[xs, 1] for xs in x_scales] + [[x_scales[-1], 1]]))
-        cross_section = self.cross_section_inner_right(w=widths[0] / 2)
-        return f"""
-        path_sweep({cross_section.scad}, path3d(path_merge_collinear({path.scad})), method = "manual", normal=UP, scale={scales.scad}, relaxed=true);
-        """
+        return ScadWriter.render(self.write_scad_cutter)
@@ -0,0 +1,155 @@
+from typing import Self, TypedDict
+import numpy as np
+import numpy.typing as npt
+
+from ..math.bezier_path import BezierPath
+from ..math.path import Path
+from ..profiler import Profiler
+
+
+class GeometryArrays(TypedDict):
+    fits: npt.NDArray[np.int64]
+    path: npt.NDArray[np.float64]
+    widths: npt.NDArray[np.float64]
+    scales: npt.NDArray[np.float64]
+    length: npt.NDArray[np.float64]
+
+
+class RampGeometry:
+    """The sampled 3D path of a ramp along with its per-station widths, sweep scales and run length.
+
+    Computed once from the ramp's source paths and shared by everything that builds on
+    it. The arrays are read-only, so a ramp whose features change must be given a fresh
+    geometry rather than having this one patched.
+    """
+
+    def __init__(
+        self,
+        fits: npt.NDArray[np.int64],
+        path: npt.NDArray[np.float64],
+        widths: npt.NDArray[np.float64],
+        scales: npt.NDArray[np.float64],
+        length: float | npt.NDArray[np.float64],
+    ) -> None:
+        for array in (fits, path, widths, scales):
+            array.setflags(write=False)
+        self.fits = fits
+        self.path = Path(path)
+        self.widths = widths
+        self.scales = Path(scales)
+        self.length = float(length)
+
+    @classmethod
+    def build(
+        cls,
+        basepath: BezierPath,
+        widths: list[BezierPath],
+        heightpath: BezierPath,
+        tolerance: float = 1e-2,
+    ) -> Self:
+        """Sample a ramp's base path, width markers and height path into its geometry.
+
+        The base path is sampled so every chord stays within tolerance of the curve, and
+        stations are then thinned so that neither the 3D path nor the half width strays
+        more than tolerance from what was sampled.
+        """
+        with Profiler.stage("fits"):
+            fits = np.maximum(
+                basepath.fits(tolerance),
+                RampGeometry.height_fits(basepath, heightpath, tolerance),
+            )
+        with Profiler.stage("with_height"):
+            path, steps = basepath.with_height(heightpath, fits)
+            Profiler.counter("solve_x iterations", steps)
+            Profiler.counter("solve_x queries", len(path.array))
+        Profiler.counter("samples", len(path.array))
+        # Measured before stations are thinned, so it can be checked against the height run.
+        length = Path(path.array[:, :2]).length
+
+        # Widths are interpolated by true distance along the base path between the
+        # markers at each segment's ends, rather than by sample index.
+        width_samples = [width.length(1) for width in widths]
+        distances = basepath.distance_at(*basepath.parameters(fits))
+        joints = basepath.arc_table[:: BezierPath.knots]
+        station_widths: npt.NDArray[np.float64] = np.interp(
+            distances, joints, width_samples
+        )
+
+        with Profiler.stage("reduce"):
+            kept = Path.simplify(
+                np.column_stack((path.array, station_widths / 2)), tolerance
+            )
+        Profiler.counter("stations", len(kept))
+        station_widths = station_widths[kept]
+        x_scales = station_widths / float(station_widths[0])  # pyright: ignore[reportAny]
+        scales = np.column_stack((x_scales, np.ones_like(x_scales)))
+        return cls(fits, path.array[kept], station_widths, scales, length)
+
+    @staticmethod
+    def height_fits(
+        basepath: BezierPath, heightpath: BezierPath, tolerance: float
+    ) -> npt.NDArray[np.int64]:
+        """Returns the samples each base segment needs for the height path over it to stay within tolerance."""
+        # Heights are only evaluated at base path stations, so a straight base segment
+        # under a curved height still needs the height path's share of samples.
+        spans = heightpath.x_extents
+        density = (heightpath.fits(tolerance, 0) + 1) / np.maximum(
+            spans[:, 1] - spans[:, 0], 1e-12
+        )
+        joints = basepath.arc_table[:: BezierPath.knots]
+        x = joints / basepath.arc_length * heightpath.x_length
+        overlap = np.clip(
+            np.minimum(x[1:, np.newaxis], spans[:, 1])
+            - np.maximum(x[:-1, np.newaxis], spans[:, 0]),
+            0,
+            None,
+        )
+        return np.maximum(np.ceil(overlap @ density) - 1, 0).astype(np.int64)
+
+    @staticmethod
+    def solve(
+        payload: tuple[
+            npt.NDArray[np.float64],
+            list[npt.NDArray[np.float64]],
+            npt.NDArray[np.float64],
+            float,
+        ],
+        profile: bool = False,
+    ) -> tuple[GeometryArrays, Profiler | None]:
+        """Build geometry from raw control point arrays and return its arrays, for use in worker processes.
+
+        When profile is set, the stages are recorded by a profiler of the worker's own,
+        which is returned for the parent to merge.
+        """
+        basepath, widths, heightpath, tolerance = payload
+        profiler = Profiler() if profile else None
+        if profiler is not None:
+            profiler.start()
+        try:
+            with Profiler.stage("geometry"):
+                geometry = RampGeometry.build(
+                    BezierPath(basepath),
+                    [BezierPath(width) for width in widths],
+                    BezierPath(heightpath),
+                    tolerance,
+                )
+        finally:
+            if profiler is not None:
+                profiler.stop()
+        return geometry.arrays, profiler
+
+    @property
+    def arrays(self) -> GeometryArrays:
+        """Returns the arrays this geometry is rebuilt from, keyed by constructor argument."""
+        return GeometryArrays(
+            fits=self.fits,
+            path=self.path.array,
+            widths=self.widths,
+            scales=self.scales.array,
+            length=np.array(self.length),
+        )
+
+    @property
+    def width(self) -> float:
+        """Returns the width at the start of the ramp, which the sweep scales are relative to."""
+        return float(self.widths[0])  # pyright: ignore[reportAny]
@@ -0,0 +1,66 @@
+from ..svg.feature_index import FeatureIndex
+from ..svg.features import Feature, RampHeight, RampPath, RampWidth
+
+
+class RampParts:
+    """Groups the features that make up each ramp, without touching their geometry.
+
+    Kept apart from Ramp so that checking a table's ramps does not load NumPy.
+    """
+
+    features: tuple[type[Feature], ...] = (RampPath, RampWidth, RampHeight)
+
+    @staticmethod
+    def collate(
+        index: FeatureIndex,
+    ) -> dict[str, tuple[RampPath, list[RampWidth], RampHeight]]:
+        """Returns the path, ordered widths and height of each ramp that has no problems."""
+        broken = {k for k, _ in RampParts._faults(index)}
+        return {
+            k: (
+                index.of_type(RampPath, k)[0],
+                sorted(index.of_type(RampWidth, k), key=lambda x: x.index),
+                index.of_type(RampHeight, k)[0],
+            )
+            for k in index.ids(RampPath)
+            if k not in broken
+        }
+
+    @staticmethod
+    def _faults(index: FeatureIndex) -> list[tuple[str, str]]:
+        """Returns the id and a description of every missing, duplicated or miscounted ramp piece."""
+        ids = index.ids(RampPath)
+        faults = [
+            (k, f"Ramp '{k}' has no RampHeight") for k in index.missing(RampHeight, ids)
+        ]
+        faults += [
+            (k, f"Ramp '{k}' has no RampWidth") for k in index.missing(RampWidth, ids)
+        ]
+        faults += [
+            (k, f"RampHeight '{k}' has no RampPath")
+            for k in index.missing(RampPath, index.ids(RampHeight))
+        ]
+        faults += [
+            (k, f"RampWidth '{k}' has no RampPath")
+            for k in index.missing(RampPath, index.ids(RampWidth))
+        ]
+        faults += [
+            (k, f"Ramp '{k}' has more than one {feature_type.__name__}")
+            for feature_type in (RampPath, RampHeight)
+            for k in index.duplicates(feature_type)
+        ]
+        for k in index.ids(RampWidth):
+            positions = sorted(width.index for width in index.of_type(RampWidth, k))
+            if positions != list(range(len(positions))):
+                faults.append((k, f"Ramp '{k}' has width indices {positions}"))
+            paths = index.of_type(RampPath, k)
+            if len(paths) == 1 and len(positions) != (ends := paths[0].segments + 1):
+                faults.append(
+                    (k, f"Ramp '{k}' has {len(positions)} RampWidths for {ends} ends")
+                )
+        return faults
+
+    @staticmethod
+    def problems(index: FeatureIndex) -> list[str]:
+        """Returns a description of every missing, duplicated or miscounted ramp piece in the index."""
+        return [problem for _, problem in RampParts._faults(index)]
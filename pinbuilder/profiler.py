@@ -0,0 +1,197 @@
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ClassVar, NamedTuple, NotRequired, TypedDict
+
+
+class Span(NamedTuple):
+    name: str
+    ramp: str | None
+    start: int
+    duration: int
+
+
+class TraceEvent(TypedDict):
+    name: str
+    ph: str
+    pid: int
+    tid: NotRequired[int]
+    ts: NotRequired[float]
+    dur: NotRequired[float]
+    args: NotRequired[dict[str, str | float]]
+
+
+class Profiler:
+    """Records how long each stage of a run takes, per ramp, along with counters and peak memory.
+
+    Code marks its stages with Profiler.stage and Profiler.counter, which do nothing unless a
+    profiler has been started. Stages nested inside a stage that names a ramp are charged
+    to that ramp too. Worker processes record into their own profiler, which is merged
+    back into the parent's. The modules only a running profiler needs are imported on
+    use, since the parser imports this one on every command.
+    """
+
+    active: ClassVar["Profiler | None"] = None
+
+    def __init__(self) -> None:
+        self.spans: list[Span] = []
+        self.counters: defaultdict[tuple[str, str | None], float] = defaultdict(float)
+        self.ramps: list[str | None] = [None]
+        self.origin = time.perf_counter_ns()
+        self.peak = 0
+
+    def start(self) -> None:
+        import tracemalloc
+
+        tracemalloc.start()
+        Profiler.active = self
+
+    def stop(self) -> None:
+        import tracemalloc
+
+        self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        Profiler.active = None
+
+    def merge(self, other: "Profiler", ramp: str | None = None) -> None:
+        """Adds the stages, counters and peak memory another process recorded, charging its unattributed ones to ramp."""
+        offset = other.origin - self.origin
+        self.spans.extend(
+            Span(span.name, span.ramp or ramp, span.start + offset, span.duration)
+            for span in other.spans
+        )
+        for (name, owner), value in other.counters.items():
+            self.counters[(name, owner or ramp)] += value
+        self.peak = max(self.peak, other.peak)
+
+    @classmethod
+    @contextmanager
+    def stage(cls, name: str, ramp: str | None = None) -> Iterator[None]:
+        """Times the enclosed block as a stage of the active profiler, if there is one."""
+        profiler = cls.active
+        if profiler is None:
+            yield
+            return
+
+        profiler.ramps.append(ramp if ramp is not None else profiler.ramps[-1])
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            profiler.spans.append(
+                Span(name, profiler.ramps.pop(), start - profiler.origin, duration)
+            )
+
+    @classmethod
+    def counter(cls, name: str, value: float = 1) -> None:
+        """Adds to a counter of the active profiler, charged to the current ramp."""
+        profiler = cls.active
+        if profiler is not None:
+            profiler.counters[(name, profiler.ramps[-1])] += value
+
+    def totals(self) -> dict[str, tuple[int, float]]:
+        """Returns the number of calls and total milliseconds of each stage, in order of first use."""
+        totals: dict[str, tuple[int, float]] = {}
+        for span in self.spans:
+            calls, elapsed = totals.get(span.name, (0, 0.0))
+            totals[span.name] = (calls + 1, elapsed + span.duration / 1e6)
+        return totals
+
+    def by_ramp(self) -> dict[str, dict[str, float]]:
+        """Returns the milliseconds and counters of each ramp, keyed by stage or counter name."""
+        ramps: defaultdict[str, defaultdict[str, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        for span in self.spans:
+            if span.ramp is not None:
+                ramps[span.ramp][span.name] += span.duration / 1e6
+        for (name, ramp), value in self.counters.items():
+            if ramp is not None:
+                ramps[ramp][name] += value
+        return {ramp: dict(values) for ramp, values in ramps.items()}
+
+    @property
+    def summary(self) -> str:
+        import resource
+
+        totals = self.totals()
+        lines = [f"{'stage':<16}{'calls':>8}{'total ms':>12}"]
+        lines += [
+            f"{name:<16}{calls:>8}{elapsed:>12.2f}"
+            for name, (calls, elapsed) in totals.items()
+        ]
+
+        ramps = self.by_ramp()
+        columns = list(
+            dict.fromkeys(name for values in ramps.values() for name in values)
+        )
+        if ramps:
+            lines.append("")
+            widths = [max(len(c), 10) + 2 for c in columns]
+            lines.append(
+                f"{'ramp':<16}" + "".join(f"{c:>{w}}" for c, w in zip(columns, widths))
+            )
+            for ramp, values in ramps.items():
+                lines.append(
+                    f"{ramp:<16}"
+                    + "".join(
+                        f"{values.get(c, 0):>{w}.2f}" for c, w in zip(columns, widths)
+                    )
+                )
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        lines.append("")
+        lines.append(
+            f"peak traced memory {self.peak / 2**20:.1f}MiB, max rss {rss:.1f}MiB"
+        )
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path) -> None:
+        """Write the recorded stages as Chrome trace-event JSON, one track per ramp."""
+        import json
+
+        pid = os.getpid()
+        tracks = {
+            ramp: i for i, ramp in enumerate(dict.fromkeys(s.ramp for s in self.spans))
+        }
+        events: list[TraceEvent] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": ramp if ramp is not None else "main"},
+            }
+            for ramp, tid in tracks.items()
+        ]
+        events.extend(
+            [
+                {
+                    "name": span.name,
+                    "ph": "X",
+                    "pid": pid,
+                    "tid": tracks[span.ramp],
+                    "ts": span.start / 1e3,
+                    "dur": span.duration / 1e3,
+                }
+                for span in self.spans
+            ]
+        )
+        events.extend(
+            [
+                {
+                    "name": name,
+                    "ph": "C",
+                    "pid": pid,
+                    "ts": 0,
+                    "args": {ramp if ramp is not None else "main": value},
+                }
+                for (name, ramp), value in self.counters.items()
+            ]
+        )
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,30 @@
+from enum import StrEnum
+
+
+class Quality(StrEnum):
+    """How finely ramps are sampled and written, from a coarse layout preview to fabrication.
+
+    Each level sets the tolerance ramp geometry is sampled and reduced to, the number of
+    decimals written and any OpenSCAD facet settings put in the generated header.
+    """
+
+    DRAFT = "draft"
+    NORMAL = "normal"
+    FINAL = "final"
+
+    @property
+    def tolerance(self) -> float:
+        """Returns the tolerance for both sampling ramp curves and thinning the samples, so ramps may stray up to twice it."""
+        return {Quality.DRAFT: 1e-1, Quality.NORMAL: 1e-2, Quality.FINAL: 1e-3}[self]
+
+    @property
+    def precision(self) -> int:
+        return {Quality.DRAFT: 2, Quality.NORMAL: 4, Quality.FINAL: 6}[self]
+
+    @property
+    def settings(self) -> str:
+        """Returns the OpenSCAD $fn, $fa and $fs assignments for the generated header, none at normal."""
+        if self is Quality.NORMAL:
+            return ""
+        fn, fa, fs = {Quality.DRAFT: (12, 12, 2), Quality.FINAL: (0, 2, 0.2)}[self]
+        return f"$fn = {fn};\n        $fa = {fa};\n        $fs = {fs};\n        "
@@ -0,0 +1,116 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from subprocess import run
+
+from .cache import RenderCache
+from .game import Game
+from .quality import Quality
+from .scad import ScadWriter
+
+
+class Render:
+    """Renders a table to STL through OpenSCAD, one ramp body or cutter at a time.
+
+    Each body and cutter is written as its own .scad unit and rendered by a bounded pool
+    of openscad processes, so the expensive sweeps run in parallel. The rendered units
+    are then imported into a final difference, which is the only render left serial.
+    Every render is cached by a hash of the SCAD it came from.
+    """
+
+    def __init__(
+        self,
+        out: Path,
+        cache: RenderCache | None = None,
+        jobs: int | None = None,
+        precision: int = 4,
+        openscad: str = "openscad",
+        quality: Quality = Quality.NORMAL,
+    ) -> None:
+        self.out = out
+        self.cache = cache
+        self.jobs = jobs if jobs is not None else os.cpu_count() or 1
+        self.precision = precision
+        self.openscad = openscad
+        self.quality = quality
+
+    def units(self, game: Game) -> dict[str, str]:
+        """Returns the SCAD source of each ramp's body and cutter, keyed by unit name."""
+        units: dict[str, str] = {}
+        for rampid, ramp in game.ramps.items():
+            for kind, fragment in (
+                ("body", ramp.write_scad),
+                ("cutter", ramp.write_scad_cutter),
+            ):
+                units[f"{kind}-{rampid}"] = (
+                    Game.headers
+                    + self.quality.settings
+                    + ScadWriter.render(fragment, self.precision)
+                )
+        return units
+
+    def key(self, scad: str, *dependencies: str) -> str:
+        """Returns the cache key of a render of scad, which also depends on the keys of any imported renders."""
+        digest = hashlib.sha256(f"{self.openscad}\n{scad}".encode())
+        for dependency in dependencies:
+            digest.update(dependency.encode())
+        return digest.hexdigest()
+
+    def render(self, scad: Path, key: str) -> bool:
+        """Render scad next to itself as STL, returning whether OpenSCAD had to run."""
+        stl = scad.with_suffix(".stl")
+        if self.cache is not None and self.cache.get(key, stl):
+            return False
+
+        try:
+            process = run(
+                [self.openscad, "-o", str(stl), str(scad)], capture_output=True
+            )
+        except FileNotFoundError:
+            raise ValueError(f"OpenSCAD binary '{self.openscad}' not found") from None
+        if process.returncode != 0:
+            raise ValueError(
+                f"OpenSCAD failed on {scad.name}: {process.stderr.decode(errors='replace')}"
+            )
+        if self.cache is not None:
+            self.cache.put(key, stl)
+        return True
+
+    def assembly(self, names: list[str]) -> str:
+        """Returns SCAD cutting the union of the rendered cutters out of the union of the rendered bodies."""
+        imports = {
+            kind: "".join(
+                f'import("units/{name}.stl");'
+                for name in names
+                if name.startswith(f"{kind}-")
+            )
+            for kind in ("body", "cutter")
+        }
+        return f"difference() {{union() {{{imports['body']}}}union() {{{imports['cutter']}}}}}\n"
+
+    def run(self, game: Game) -> tuple[int, int]:
+        """Render the game to ramps.stl in out, returning how many renders ran and how many came from the cache."""
+        units = self.units(game)
+        directory = self.out / "units"
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.iterdir():
+            if stale.stem not in units:
+                stale.unlink()
+        keys: dict[str, str] = {}
+        for name, scad in units.items():
+            _ = (directory / f"{name}.scad").write_text(scad)
+            keys[name] = self.key(scad)
+
+        def render(name: str) -> bool:
+            return self.render(directory / f"{name}.scad", keys[name])
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            rendered = list(pool.map(render, units))
+
+        assembly = self.assembly(list(units))
+        _ = (self.out / "ramps.scad").write_text(assembly)
+        rendered.append(
+            self.render(self.out / "ramps.scad", self.key(assembly, *keys.values()))
+        )
+        return sum(rendered), len(rendered) - sum(rendered)
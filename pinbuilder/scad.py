@@ -0,0 +1,55 @@
+import io
+import numpy as np
+import numpy.typing as npt
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+Fragment = str | Callable[["ScadWriter"], None]
+
+
+class ScadWriter:
+    """Streams SCAD source to a file, formatting point arrays in bulk.
+
+    Arrays are written in chunks of rows, each formatted with a single printf-style
+    operation rather than one str() per element, so memory use stays flat however many
+    points a path has.
+    """
+
+    def __init__(self, file: TextIO, precision: int = 4, chunk: int = 4096) -> None:
+        self.file = file
+        self.precision = precision
+        self.chunk = chunk
+
+    @classmethod
+    def render(cls, fragment: Fragment, precision: int = 4) -> str:
+        """Returns a fragment as a string instead of streaming it to a file."""
+        buffer = io.StringIO()
+        cls(buffer, precision).fragment(fragment)
+        return buffer.getvalue()
+
+    def text(self, text: str) -> None:
+        _ = self.file.write(text)
+
+    def fragment(self, fragment: Fragment) -> None:
+        """Writes a pre-rendered string or calls a writer callback."""
+        if isinstance(fragment, str):
+            self.text(fragment)
+        else:
+            fragment(self)
+
+    def array(self, array: npt.NDArray[np.float64]) -> None:
+        """Writes an (N, D) array as a SCAD list of points."""
+        row = "[" + ",".join([f"%.{self.precision}f"] * array.shape[1]) + "]"  # pyright: ignore[reportAny]
+        self.text("[")
+        for start in range(0, len(array), self.chunk):
+            rows = array[start : start + self.chunk]
+            if start > 0:
+                self.text(",")
+            self.text(",".join([row] * len(rows)) % tuple(rows.ravel().tolist()))
+        self.text("]")
+
+    def union(self, fragments: Iterable[Fragment]) -> None:
+        self.text("union() {")
+        for fragment in fragments:
+            self.fragment(fragment)
+        self.text("}")
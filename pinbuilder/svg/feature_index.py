@@ -0,0 +1,46 @@
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from .features import Feature
+
+
+class FeatureIndex:
+    """Features of a document bucketed by type and by label id in a single pass."""
+
+    def __init__(self, features: Iterable[Feature] = ()) -> None:
+        self.features: list[Feature] = []
+        self.by_type: defaultdict[type[Feature], list[Feature]] = defaultdict(list)
+        self.by_id: defaultdict[tuple[type[Feature], str], list[Feature]] = defaultdict(
+            list
+        )
+        for feature in features:
+            self.add(feature)
+
+    def add(self, feature: Feature) -> None:
+        self.features.append(feature)
+        self.by_type[type(feature)].append(feature)
+        if feature.labels:
+            self.by_id[(type(feature), feature.labels[0])].append(feature)
+
+    def __iter__(self) -> Iterator[Feature]:
+        return iter(self.features)
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def of_type[T: Feature](self, cls: type[T], id: str | None = None) -> list[T]:
+        """Returns the features of exactly the given type, optionally only those with the given id."""
+        if id is None:
+            return self.by_type.get(cls, [])  # pyright: ignore[reportReturnType]
+        return self.by_id.get((cls, id), [])  # pyright: ignore[reportReturnType]
+
+    def ids(self, cls: type[Feature]) -> list[str]:
+        """Returns the distinct ids used by features of the given type, in document order."""
+        return list(dict.fromkeys(f.labels[0] for f in self.of_type(cls) if f.labels))
+
+    def duplicates(self, cls: type[Feature]) -> list[str]:
+        """Returns the ids that more than one feature of the given type uses."""
+        return [id for id in self.ids(cls) if len(self.of_type(cls, id)) > 1]
+
+    def missing(self, cls: type[Feature], ids: Iterable[str]) -> list[str]:
+        """Returns the ids which no feature of the given type uses."""
+        return [id for id in ids if (cls, id) not in self.by_id]
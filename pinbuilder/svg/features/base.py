@@ -1,7 +1,12 @@
 import xml.etree.ElementTree as ET
-from typing import override
+from functools import cached_property
+from typing import TYPE_CHECKING, override
+from ...math.affine import Affine
+from ...math.svgd import svgd_points
 from ...math.vectors import Vec2
-from ...math.bezier_path import BezierPath
+
+if TYPE_CHECKING:
+    from ...math.bezier_path import BezierPath
 
 
 class Feature:
@@ -12,24 +17,46 @@ class Feature:
         *,
         node: ET.Element,
         dimensions: Vec2,
-        transform: Vec2,
+        transform: Affine,
         labels: list[str],
+        keep_node: bool = True,
     ):
-        svgd = node.get("d", None)
-        self.bezierpath = (
-            BezierPath.from_svgd(svgd, dimensions, transform) if svgd else None
-        )
-
-        cx, cy = node.get("cx", None), node.get("cy", None)
-        self.center = (
-            Vec2.from_coords(float(cx), dimensions.y - float(cy)) if cx and cy else None
-        )
+        self.svgd = node.get("d", None)
+        self.cx, self.cy = node.get("cx", None), node.get("cy", None)
+        self.r = node.get("r", None)
 
-        self.node = node
+        self.node = node if keep_node else None
         self.dimensions = dimensions
         self.transform = transform
         self.labels = labels
 
+    @cached_property
+    def bezierpath(self) -> "BezierPath | None":
+        """Returns the decoded d attribute, parsed on first access."""
+        if not self.svgd:
+            return None
+        from ...math.bezier_path import BezierPath
+
+        return BezierPath.from_svgd(self.svgd, self.dimensions, self.transform)
+
+    @cached_property
+    def segments(self) -> int:
+        """Returns how many cubic segments the d attribute decodes to, without NumPy."""
+        if not self.svgd:
+            return 0
+        return (len(svgd_points(self.svgd)) - 1) // 3
+
+    @cached_property
+    def center(self) -> Vec2 | None:
+        if not self.cx or not self.cy:
+            return None
+        x, y = self.transform.point(float(self.cx), float(self.cy))
+        return Vec2.from_coords(x, self.dimensions.y - y)
+
+    @property
+    def radius(self) -> float:
+        return float(self.r) * self.transform.scaling if self.r else 0.0
+
     @override
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__}>"
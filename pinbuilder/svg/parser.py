@@ -1,84 +1,208 @@
 import xml.etree.ElementTree as ET
-from itertools import chain
+from collections.abc import Iterator
+from functools import cache
 from pathlib import Path
 import re
+from ..math.affine import Affine
 from ..math.vectors import Vec2
+from ..profiler import Profiler
+from .feature_index import FeatureIndex
 from .features import Feature, PlayfieldDimensions, Unknown
 
 
+# Millimetres per unit of each SVG length unit, with user units being CSS pixels.
+UNITS = {
+    "": 25.4 / 96,
+    "px": 25.4 / 96,
+    "pt": 25.4 / 72,
+    "pc": 25.4 / 6,
+    "in": 25.4,
+    "cm": 10,
+    "mm": 1,
+    "q": 0.25,
+}
+LENGTH = re.compile(r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([a-zA-Z]*)\s*")
+
+
+def parse_length(raw: str) -> float:
+    """Returns an SVG length in millimetres."""
+    results = LENGTH.fullmatch(raw)
+    if not results or results.group(2).lower() not in UNITS:
+        raise ValueError(f"Got bad length: {raw}")
+    return float(results.group(1)) * UNITS[results.group(2).lower()]
+
+
+def parse_viewbox_rect(node: ET.Element) -> tuple[float, float, float, float] | None:
+    """Returns the x, y, width and height of the document's viewBox, if it has one."""
+    raw = node.get("viewBox")
+    if raw is None:
+        return None
+    x, y, width, height = (float(v) for v in raw.replace(",", " ").split())
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Got bad viewBox: {raw}")
+    return x, y, width, height
+
+
 def parse_dimensions(node: ET.Element) -> Vec2:
-    width = float(node.get("width", "0mm")[:-2])
-    height = float(node.get("height", "0mm")[:-2])
+    """Returns the document size in millimetres, sizing a missing width or height from the viewBox."""
+    width, height = (
+        parse_length(raw) if (raw := node.get(attribute)) is not None else None
+        for attribute in ("width", "height")
+    )
+    if width is None or height is None:
+        rect = parse_viewbox_rect(node)
+        if rect is None:
+            raise ValueError("SVG needs a width and height or a viewBox")
+        _, _, box_width, box_height = rect
+        if height is None:
+            height = (
+                box_height * UNITS["px"]
+                if width is None
+                else width * box_height / box_width
+            )
+        if width is None:
+            width = height * box_width / box_height
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Got bad dimensions: {width}mm x {height}mm")
     return Vec2.from_coords(width, height)
 
 
-def parse_transform(node: ET.Element, transform: Vec2) -> Vec2:
-    exp = r"translate\(([0-9.-]*),([0-9.-]*)\)"
-    raw = node.get("transform", "translate(0,0)")
-    results = re.match(exp, raw)
-    if not results:
-        raise ValueError(f"Got bad transform: {raw}")
-    return transform + Vec2.from_coords(
-        float(results.group(1)), float(results.group(2))
+def parse_viewbox(node: ET.Element, dimensions: Vec2) -> Affine:
+    """Returns the transform from the document's user units to millimetres."""
+    rect = parse_viewbox_rect(node)
+    if rect is None:
+        return Affine.scale(UNITS["px"])
+    x, y, width, height = rect
+    return Affine.scale(dimensions.x / width, dimensions.y / height) @ Affine.translate(
+        -x, -y
+    )
+
+
+def parse_transform(node: ET.Element, transform: Affine) -> Affine:
+    return transform @ Affine.from_string(node.get("transform", ""))
+
+
+def node_key(node: ET.Element, dimensions: Vec2, transform: Affine) -> tuple[str, ...]:
+    """Returns everything a feature is decoded from, so unchanged elements can be reused."""
+    return (
+        node.tag,
+        node.get("id", ""),
+        node.get("{http://www.inkscape.org/namespaces/inkscape}label", ""),
+        node.get("d", ""),
+        node.get("cx", ""),
+        node.get("cy", ""),
+        node.get("r", ""),
+        str(dimensions.coords),
+        str(transform.coords),
     )
 
 
-features_dict = {
-    name: feat for feat in Feature.__subclasses__() for name in feat.names()
+@cache
+def feature_types() -> dict[str, type[Feature]]:
+    """Returns every feature class keyed by each name it can be labelled with, built on first use."""
+    return {
+        name: feature
+        for feature in Feature.__subclasses__()
+        for name in feature.names()
+    }
+
+
+SVG = "{http://www.w3.org/2000/svg}"
+SKIPPED = {
+    f"{SVG}defs",
+    f"{SVG}image",
+    "{http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd}namedview",
 }
 
 
-def parse_tree(
-    node: ET.Element, dimensions: Vec2 | None = None, transform: Vec2 | None = None
-) -> list[Feature]:
-    if not dimensions:
-        dimensions = Vec2.from_coords(0, 0)
-    if not transform:
-        transform = Vec2.from_coords(0, 0)
-
-    match node.tag:
-        case "{http://www.w3.org/2000/svg}svg":
-            dimensions = parse_dimensions(node)
-            return [
-                PlayfieldDimensions(
-                    node=node, dimensions=dimensions, transform=transform, labels=[]
-                )
-            ] + list(
-                chain(*[parse_tree(child, dimensions, transform) for child in node])
-            )
-        case (
-            "{http://www.w3.org/2000/svg}defs"
-            | "{http://www.w3.org/2000/svg}image"
-            | "{http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd}namedview"
-        ):
-            return []
-        case "{http://www.w3.org/2000/svg}g":
-            return list(
-                chain(
-                    *[
-                        parse_tree(child, dimensions, parse_transform(node, transform))
-                        for child in node
-                    ]
-                )
-            )
-        case "{http://www.w3.org/2000/svg}path" | "{http://www.w3.org/2000/svg}circle":
-            feature_type, *rest = node.get(
-                "{http://www.inkscape.org/namespaces/inkscape}label", "Unknown"
-            ).split(" ")
-
-            return [
-                features_dict.get(feature_type, Unknown)(
-                    node=node,
-                    dimensions=dimensions,
-                    transform=parse_transform(node, transform),
-                    labels=rest,
-                )
-            ]
-        case _:
-            raise ValueError(f"Unknown SVG tag: {node.tag}")
-
-
-def parse(path: Path) -> list[Feature]:
-    tree = ET.parse(path)
-    root = tree.getroot()
-    return parse_tree(root)
+def iterparse(
+    path: Path,
+    include: tuple[type[Feature], ...] | None = None,
+    known: dict[tuple[str, ...], Feature] | None = None,
+    keep_nodes: bool = True,
+) -> Iterator[Feature]:
+    """Stream the features of an SVG as its elements are read.
+
+    Group transforms are tracked on a stack as groups open and close, and finished
+    groups and skipped subtrees such as images and defs are cleared so they can be
+    freed. Only features whose type is a subclass of one in include are created, and
+    created features are reused from and recorded in known if given. Without
+    keep_nodes, features do not hold on to their elements.
+    """
+    dimensions = Vec2.from_coords(0, 0)
+    transforms = [Affine()]
+    skip = 0
+
+    node: ET.Element
+    for event, node in ET.iterparse(path, events=("start", "end")):  # pyright: ignore[reportAny]
+        if skip > 0:
+            skip += 1 if event == "start" else -1
+            if skip == 0 and node.tag in SKIPPED:
+                node.clear()
+            continue
+
+        if event == "end":
+            if node.tag == f"{SVG}g":
+                _ = transforms.pop()
+                node.clear()
+            continue
+
+        match node.tag:
+            case "{http://www.w3.org/2000/svg}svg":
+                dimensions = parse_dimensions(node)
+                transforms[-1] = parse_transform(node, parse_viewbox(node, dimensions))
+                if include is None or issubclass(PlayfieldDimensions, include):
+                    yield PlayfieldDimensions(
+                        node=node,
+                        dimensions=dimensions,
+                        transform=transforms[-1],
+                        labels=[],
+                        keep_node=keep_nodes,
+                    )
+            case tag if tag in SKIPPED:
+                skip = 1
+            case "{http://www.w3.org/2000/svg}g":
+                transforms.append(parse_transform(node, transforms[-1]))
+            case (
+                "{http://www.w3.org/2000/svg}path"
+                | "{http://www.w3.org/2000/svg}circle"
+            ):
+                skip = 1
+                feature_transform = parse_transform(node, transforms[-1])
+                key = node_key(node, dimensions, feature_transform)
+                if known is not None and key in known:
+                    feature = known[key]
+                    if include is None or isinstance(feature, include):
+                        yield feature
+                    continue
+
+                feature_type, *rest = node.get(
+                    "{http://www.inkscape.org/namespaces/inkscape}label", "Unknown"
+                ).split(" ")
+                feature_class = feature_types().get(feature_type, Unknown)
+                if include is not None and not issubclass(feature_class, include):
+                    continue
+
+                with Profiler.stage("features"):
+                    feature = feature_class(
+                        node=node,
+                        dimensions=dimensions,
+                        transform=feature_transform,
+                        labels=rest,
+                        keep_node=keep_nodes,
+                    )
+                if known is not None:
+                    known[key] = feature
+                yield feature
+            case _:
+                raise ValueError(f"Unknown SVG tag: {node.tag}")
+
+
+def parse(
+    path: Path,
+    known: dict[tuple[str, ...], Feature] | None = None,
+    include: tuple[type[Feature], ...] | None = None,
+    keep_nodes: bool = True,
+) -> FeatureIndex:
+    """Parse the features of an SVG, keeping only the given feature types if include is set."""
+    return FeatureIndex(iterparse(path, include, known, keep_nodes))
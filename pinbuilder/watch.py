@@ -0,0 +1,93 @@
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from .cache import GeometryCache
+from .game import Game
+from .objects.ramp import Ramp
+from .quality import Quality
+from .scad import ScadWriter
+from .svg.features import Feature
+
+
+class Watch:
+    """Regenerates a table's preview.scad whenever its SVG changes, reusing unchanged work.
+
+    Decoded features are kept keyed by their element's id, label, geometry attributes and
+    transform, so a rebuild only decodes elements that changed. Ramp SCAD fragments are
+    kept keyed by the ramp's id and input digest, so only ramps touched by those elements
+    are swept again.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        out: Path,
+        cache: GeometryCache | None = None,
+        jobs: int = 1,
+        precision: int = 4,
+        quality: Quality = Quality.NORMAL,
+        tolerance: float = 1e-2,
+    ) -> None:
+        self.path = path
+        self.out = out
+        self.cache = cache
+        self.jobs = jobs
+        self.precision = precision
+        self.quality = quality
+        self.tolerance = tolerance
+        self.features: dict[tuple[str, ...], Feature] = {}
+        self.fragments: dict[tuple[str, str], tuple[str, str]] = {}
+
+    def rebuild(self) -> tuple[int, int]:
+        """Regenerate the output, returning how many ramps were rebuilt and how many were reused."""
+        game = Game(self.path, self.features, Ramp.features, self.tolerance)
+        current = set(game.svg_features)
+        self.features = {
+            key: feature for key, feature in self.features.items() if feature in current
+        }
+
+        # The digest only covers a ramp's geometry, so identical ramps need their id
+        # alongside it to keep one fragment each.
+        keys = {(k, ramp.digest): ramp for k, ramp in game.ramps.items()}
+        stale = {key: ramp for key, ramp in keys.items() if key not in self.fragments}
+        game.solve(list(stale.values()), self.cache, self.jobs)
+        for key, ramp in stale.items():
+            self.fragments[key] = (
+                ScadWriter.render(ramp.write_scad, self.precision),
+                ScadWriter.render(ramp.write_scad_cutter, self.precision),
+            )
+
+        fragments = {key: self.fragments[key] for key in keys}
+        self.fragments = fragments
+
+        Game.write(
+            self.out,
+            [body for body, _ in fragments.values()],
+            [cutter for _, cutter in fragments.values()],
+            self.precision,
+            self.quality,
+        )
+        return len(stale), len(fragments) - len(stale)
+
+    def run(self, interval: float = 0.25) -> None:
+        """Poll the SVG for changes and rebuild on each one until interrupted."""
+        mtime = None
+        while True:
+            try:
+                current = self.path.stat().st_mtime_ns
+            except FileNotFoundError:
+                current = None
+            if current is not None and current != mtime:
+                mtime = current
+                start = time.perf_counter()
+                try:
+                    rebuilt, reused = self.rebuild()
+                except (ET.ParseError, ValueError) as error:
+                    print(f"Skipped rebuild: {error}")
+                else:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(
+                        f"Rebuilt {rebuilt} ramps, reused {reused} in {elapsed:.1f}ms"
+                    )
+            time.sleep(interval)
@@ -0,0 +1,28 @@
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from pinbuilder.check import ClearanceCheck
+from pinbuilder.game import Game
+
+TABLE = """<svg width="500mm" height="1000mm" viewBox="0 0 500 1000"
+  xmlns="http://www.w3.org/2000/svg"
+  xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">
+  <path inkscape:label="RampPath a" d="M 100,600 L 100,400"/>
+  <path inkscape:label="RampWidth a 0" d="M 80,600 H 120"/>
+  <path inkscape:label="RampWidth a 1" d="M 80,400 H 120"/>
+  <path inkscape:label="RampHeight a" d="M 0,990 L 200,990"/>
+  <path inkscape:label="Target" d="M {x},200 L 300,200 L 300,800 L {x},800 Z"/>
+</svg>"""
+
+
+@pytest.mark.parametrize(("x", "expected"), [(115, 1), (130, 0)])
+def test_ramp_beside_a_long_edge(tmp_path: Path, x: int, expected: int):
+    svg = tmp_path / "table.svg"
+    svg.write_text(TABLE.format(x=x))
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(svg)
+    collisions = ClearanceCheck(game.ramps).run(game.svg_features)
+    assert len(collisions) == expected
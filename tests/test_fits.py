@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from pinbuilder.math.bezier_path import BezierPath
+from pinbuilder.objects.ramp_geometry import RampGeometry
+
+
+def path(points: list[list[float]]) -> BezierPath:
+    return BezierPath.from_points(np.array(points, dtype=np.float64))
+
+
+def chord_error(polyline: np.ndarray, bezierpath: BezierPath) -> float:
+    """Returns how far a dense sampling of the path strays from the polyline."""
+    dense = bezierpath.path(2000).array
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    ap = dense[:, np.newaxis] - a
+    u = np.clip(np.sum(ap * ab, axis=2) / np.sum(ab * ab, axis=1), 0, 1)
+    offset = ap - u[:, :, np.newaxis] * ab
+    return float(np.max(np.min(np.sqrt(np.sum(offset * offset, axis=2)), axis=1)))
+
+
+@pytest.mark.parametrize(
+    "points",
+    [
+        [[0, 0], [25, 0], [75, 0], [100, 0]],
+        [[0, 0], [100, 0], [100, 0], [100, 0]],
+        [[0, 0], [0, 0], [0, 0], [30, 40]],
+    ],
+)
+def test_straight_segments_collapse_to_their_endpoints(points: list[list[float]]):
+    assert path(points).fits(1e-2).tolist() == [0]
+
+
+def test_minimum_only_applies_to_curved_segments():
+    bezierpath = path([[0, 0], [0, 10], [10, 10], [10, 0], [20, 0], [30, 0], [40, 0]])
+    assert bezierpath.fits(1, 16).tolist() == [16, 0]
+    assert bezierpath.fits(1, 0)[0] < 16
+
+
+@pytest.mark.parametrize("threshold", [1e-1, 1e-2, 1e-3])
+def test_curved_segments_stay_within_threshold(threshold: float):
+    bezierpath = path(
+        [[0, 0], [0, 10], [10, 10], [10, 0], [20, -10], [40, 30], [50, 0]]
+    )
+    polyline = bezierpath.path(bezierpath.fits(threshold, 0)).array
+    assert chord_error(polyline, bezierpath) <= threshold
+
+
+def test_straight_base_samples_curved_height():
+    basepath = path([[0, 0], [25, 0], [75, 0], [100, 0]])
+    heightpath = path([[0, 0], [30, 40], [70, 40], [100, 0]])
+    fits = RampGeometry.height_fits(basepath, heightpath, 1e-2)
+    assert basepath.fits(1e-2).tolist() == [0]
+    stations = basepath.with_height(heightpath, fits)[0].array
+    # Stations are spread evenly along the base rather than along the height curve,
+    # so the error is only held to the order of the tolerance.
+    assert chord_error(stations[:, [0, 2]], heightpath) <= 2e-2
+    bare = basepath.with_height(heightpath, basepath.fits(1e-2))[0].array
+    assert chord_error(bare[:, [0, 2]], heightpath) > 1
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_cli_import_does_not_load_numpy():
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, pinbuilder.cli; print('numpy' in sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parents[1],
+        text=True,
+    )
+    assert process.stdout.strip() == "False"
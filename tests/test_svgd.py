@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pytest
+
+from pinbuilder.math.svgd import parse_svgd
+
+
+def ends(points: np.ndarray) -> list[list[float]]:
+    """Returns the end point of each segment, skipping the control points."""
+    return points[::3].tolist()
+
+
+def test_lines_store_quarter_controls():
+    points = parse_svgd("M0,0 L4,8")
+    np.testing.assert_allclose(points, [[0, 0], [1, 2], [3, 6], [4, 8]])
+
+
+def test_relative_commands():
+    points = parse_svgd("m1,1 l2,2 h3 v-1 z")
+    assert ends(points) == [[1, 1], [3, 3], [6, 3], [6, 2], [1, 1]]
+
+
+def test_implicit_repeats_after_move_are_lines():
+    assert ends(parse_svgd("M0 0 1 1 2 0")) == [[0, 0], [1, 1], [2, 0]]
+    assert ends(parse_svgd("m1 1 1 1 1 -1")) == [[1, 1], [2, 2], [3, 1]]
+
+
+def test_second_subpath_is_joined_with_a_line():
+    assert ends(parse_svgd("M0 0 L1 1 M5 5 L6 6")) == [[0, 0], [1, 1], [5, 5], [6, 6]]
+
+
+def test_smooth_cubic_reflects_previous_control():
+    points = parse_svgd("M0,0 C1,1 2,1 3,0 S5,-1 6,0")
+    np.testing.assert_allclose(points[4], [4, -1])
+
+
+def test_smooth_cubic_without_previous_cubic_starts_at_current_point():
+    points = parse_svgd("M0,0 L3,0 S5,-1 6,0")
+    np.testing.assert_allclose(points[4], [3, 0])
+
+
+def test_quadratics_become_exact_cubics():
+    points = parse_svgd("M0,0 Q3,3 6,0")
+    np.testing.assert_allclose(points, [[0, 0], [2, 2], [4, 2], [6, 0]])
+
+
+def test_smooth_quadratic_reflects_previous_control():
+    # The reflected control of T is (9, -3), giving cubic controls two thirds of the way to it.
+    points = parse_svgd("M0,0 Q3,3 6,0 T12,0")
+    np.testing.assert_allclose(points[4:], [[8, -2], [10, -2], [12, 0]])
+
+
+def test_arc_quarter_circle():
+    points = parse_svgd("M10,0 A10,10 0 0 1 0,10")
+    assert len(points) == 4
+    np.testing.assert_allclose(points[[0, -1]], [[10, 0], [0, 10]], atol=1e-12)
+    k = 4 / 3 * math.tan(math.pi / 8) * 10
+    np.testing.assert_allclose(points[1:3], [[10, k], [k, 10]], atol=1e-12)
+
+
+def test_arc_half_circle_splits_into_quarters():
+    points = parse_svgd("M0 0 a10 10 0 1 0 20 0")
+    assert len(points) == 7
+    np.testing.assert_allclose(points[3], [10, 10], atol=1e-12)
+    np.testing.assert_allclose(points[6], [20, 0], atol=1e-12)
+
+
+def test_arc_packed_flags():
+    assert np.array_equal(
+        parse_svgd("M0,0 A5,5 0 0110,0"), parse_svgd("M0,0 A5,5 0 0 1 10,0")
+    )
+
+
+def test_arc_with_zero_radius_is_a_line():
+    np.testing.assert_array_equal(
+        parse_svgd("M0,0 A0,5 0 0 1 3,3"), parse_svgd("M0,0 L3,3")
+    )
+
+
+@pytest.mark.parametrize(
+    ("packed", "spaced"),
+    [
+        ("M1.5.5.5.5", "M1.5 .5 L.5 .5"),
+        ("M0 0L10-5", "M0 0 L10 -5"),
+        ("M0,0L1e1-2E-1", "M0 0 L10 -0.2"),
+    ],
+)
+def test_packed_numbers(packed: str, spaced: str):
+    np.testing.assert_array_equal(parse_svgd(packed), parse_svgd(spaced))
+
+
+@pytest.mark.parametrize(
+    "svgd", ["0 0 L1 1", "M0 0 L1", "M0 0 L1 x", "M0 0 A1 1 0 2 0 1 1"]
+)
+def test_bad_path_data(svgd: str):
+    with pytest.raises(ValueError):
+        _ = parse_svgd(svgd)
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+from pinbuilder.watch import Watch
+
+RAMP = """
+  <path inkscape:label="RampPath {id}" d="M 100,900 L 100,100"/>
+  <path inkscape:label="RampWidth {id} 0" d="M 80,900 H 120"/>
+  <path inkscape:label="RampWidth {id} 1" d="M 80,100 H 120"/>
+  <path inkscape:label="RampHeight {id}" d="M 0,990 L 200,980"/>
+"""
+
+
+def test_identical_ramps_keep_a_fragment_each(tmp_path: Path):
+    svg = tmp_path / "twin.svg"
+    svg.write_text(
+        '<svg width="500mm" height="1000mm" xmlns="http://www.w3.org/2000/svg"'
+        ' xmlns:inkscape="http://www.inkscape.org/namespaces/inkscape">'
+        + RAMP.format(id="a")
+        + RAMP.format(id="b")
+        + "</svg>"
+    )
+    watch = Watch(svg, tmp_path / "out")
+    assert watch.rebuild() == (2, 0)
+    assert watch.rebuild() == (0, 2)
+    scad = (tmp_path / "out" / "preview.scad").read_text()
+    assert scad.count("path_sweep(") == 4